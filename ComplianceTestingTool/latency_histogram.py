@@ -0,0 +1,90 @@
+"""
+Latency histogram shared by openhalo_test_suite.py and openhalo_test_suite_docker.py,
+so both tools compute percentiles the same way.
+"""
+
+class LatencyHistogram:
+    """
+    Fixed-memory latency histogram with HDR-style log buckets.
+    Values are recorded in microseconds: exact below 128 us, then 64 linear
+    sub-buckets per power of two (< 1.6% relative error).
+    Only non-empty buckets are stored (at most ~2100), so one histogram per
+    second of a run stays cheap.
+    Histograms can be merged across threads and processes (they are picklable).
+    """
+
+    SUB_BITS = 7
+    SUB_COUNT = 1 << SUB_BITS        # 128 exact buckets
+    HALF_COUNT = SUB_COUNT // 2      # 64 sub-buckets per magnitude
+    MAX_BITS = 38                    # ~76 hours in microseconds, plenty for a query
+
+    PERCENTILES = [50, 90, 95, 99, 99.9]
+
+    def __init__(self):
+        self.counts = {} # bucket index -> count
+        self.count = 0
+        self.total = 0.0 # ms, exact sum for the mean
+        self.min = 0.0
+        self.max = 0.0
+
+    def _bucket_index(self, value_us):
+        if value_us < self.SUB_COUNT:
+            return value_us
+        shift = min(value_us.bit_length(), self.MAX_BITS) - self.SUB_BITS
+        sub = min(value_us >> shift, self.SUB_COUNT - 1) - self.HALF_COUNT
+        return self.SUB_COUNT + (shift - 1) * self.HALF_COUNT + sub
+
+    def _bucket_value(self, index):
+        """Midpoint of a bucket, in ms"""
+        if index < self.SUB_COUNT:
+            return index / 1000
+        shift = (index - self.SUB_COUNT) // self.HALF_COUNT + 1
+        sub = (index - self.SUB_COUNT) % self.HALF_COUNT + self.HALF_COUNT
+        low = sub << shift
+        return (low + (1 << shift) / 2) / 1000
+
+    def record(self, latency_ms):
+        """Record one latency (in milliseconds)"""
+        value_us = max(int(latency_ms * 1000), 0)
+        index = self._bucket_index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        if self.count == 0 or latency_ms < self.min:
+            self.min = latency_ms
+        if latency_ms > self.max:
+            self.max = latency_ms
+        self.count += 1
+        self.total += latency_ms
+
+    def merge(self, other):
+        """Add the content of another histogram into this one"""
+        if other.count == 0:
+            return self
+        for index, c in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + c
+        self.min = other.min if self.count == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+        return self
+
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def percentile(self, p):
+        """Latency (ms) below which p% of the recorded values fall"""
+        if self.count == 0:
+            return 0
+        rank = max(int(round(self.count * p / 100)), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                # The bucket midpoint can overshoot the real extremes
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def summary(self):
+        """Dictionary p50/p90/p95/p99/p99.9/max (ms)"""
+        stats = {f"p{p:g}": self.percentile(p) for p in self.PERCENTILES}
+        stats["max"] = self.max
+        return stats
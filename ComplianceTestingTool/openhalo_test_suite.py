@@ -7,14 +7,38 @@ Integrated with Markdown Report Test Suite.
 import time
 import json
 import mysql.connector
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from typing import List, Dict, Tuple
-from statistics import mean, median
+from statistics import mean, median, pstdev
 import sys
+import os
+import io
+import queue
+import collections
+import tempfile
+import threading
+import math
+import re
+import hashlib
+import datetime
+from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
 import uuid
 from copy import deepcopy
+from string import Template
 import random
 import concurrent.futures
+import asyncio
+import sqlite3
+import argparse
+try:
+    import mysql.connector.aio as mysql_aio # Needs mysql-connector-python >= 9.0
+except ImportError:
+    mysql_aio = None
+try:
+    import psycopg2 # Optional: native PostgreSQL protocol access to the OpenHalo backend
+except ImportError:
+    psycopg2 = None
+from latency_histogram import LatencyHistogram # Shared with openhalo_test_suite_docker.py
 import matplotlib.pyplot as plt
 import matplotlib 
 matplotlib.use('Agg')
@@ -32,23 +56,501 @@ class QueryResult:
     status: str
     rows: int
     error: str = None
+    p99_time: float = 0
+    max_time: float = 0
+    first_row_time: float = 0 # Median time to first row (streaming mode only)
+    fingerprint: str = None # See ResultFingerprint
+    protocol: str = "text" # 'text', or 'prepared' (binary protocol, see PreparedStatementCache)
+    phases: Dict = None # Tracing: median time (ms) per client-side phase, see QueryTracer
+    # Server side (ServerStatsCollector), over all statements of the test incl. warm-up
+    server_time: float = None # Mean server execution time per statement (ms)
+    server_calls: int = None
+    server_rows: int = None # MySQL: rows examined; PostgreSQL: rows returned / affected
+    buffer_hits: int = None
+    buffer_reads: int = None
+    prepare_time: float = 0 # Prepared mode: COM_STMT_PREPARE round trip (ms), not included in times
+    plans: Dict = None # Slow queries: EXPLAIN output of both engines and their differences, see PlanCollector
+    # Confidence interval of the median time (ms), see median_ci; None with too few samples
+    ci_low: float = None
+    ci_high: float = None
+    # Warm-up (SELECTs): first execution of the exact statement on the session, before steady state
+    cold_time: float = None
+    warmup_runs: int = 0
+    warmup_converged: bool = None # Steady state reached before max_warmup_runs / warmup_budget_seconds (None = not checked)
+    sql_hash: str = None # Statement text, to compare runs of the same query only (dyn_* queries are random)
+
+# --- Latency Histogram ---
+
+class LatencyTimeSeries:
+    """
+    Per-interval (1 s by default) view of a stress run: one LatencyHistogram and one
+    error counter per interval, indexed by completion time since `origin`
+    (time.time() at the start of the steady-state window). Mergeable like LatencyHistogram.
+    """
+
+    def __init__(self, origin, interval=1.0):
+        self.origin = origin
+        self.interval = interval
+        self.hists = {}  # interval index -> LatencyHistogram
+        self.errors = {} # interval index -> number of errors
+
+    def _index(self, when):
+        return int((when - self.origin) // self.interval)
+
+    def record(self, latency_ms, when):
+        index = self._index(when)
+        if index >= 0:
+            self.hists.setdefault(index, LatencyHistogram()).record(latency_ms)
+
+    def record_error(self, when):
+        index = self._index(when)
+        if index >= 0:
+            self.errors[index] = self.errors.get(index, 0) + 1
+
+    def merge(self, other):
+        for index, h in other.hists.items():
+            self.hists.setdefault(index, LatencyHistogram()).merge(h)
+        for index, e in other.errors.items():
+            self.errors[index] = self.errors.get(index, 0) + e
+        return self
+
+    def to_list(self, duration):
+        """One point per interval of the steady-state window (queries completing after it are ignored)"""
+        points = []
+        for index in range(int(math.ceil(duration / self.interval))):
+            h = self.hists.get(index, LatencyHistogram())
+            points.append({
+                "t": index * self.interval,
+                "tps": h.count / self.interval,
+                "errors": self.errors.get(index, 0),
+                "p50_latency": h.percentile(50),
+                "p95_latency": h.percentile(95),
+                "p99_latency": h.percentile(99),
+                "max_latency": h.max
+            })
+        return points
+
+@dataclass
+class WorkerStats:
+    """Latencies and counters of stress workers, merged across threads and processes"""
+    series: LatencyTimeSeries
+    hist: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: int = 0
+    backlog: int = 0 # Open loop: requests scheduled during the run but never sent
+    classes: Dict = field(default_factory=dict) # Query class -> LatencyHistogram (workload profiles)
+    cpu_usages: List[float] = field(default_factory=list) # CPU share of a core, per load process
+    prepare: LatencyHistogram = field(default_factory=LatencyHistogram) # Prepared mode: one sample per statement shape
+    pool_wait: LatencyHistogram = field(default_factory=LatencyHistogram) # Pooled mode: wait for a free connection
+
+    def record(self, latency_ms, query_class=None):
+        self.hist.record(latency_ms)
+        self.series.record(latency_ms, time.time())
+        if query_class:
+            self.classes.setdefault(query_class, LatencyHistogram()).record(latency_ms)
+
+    def record_error(self):
+        self.errors += 1
+        self.series.record_error(time.time())
+
+    def merge(self, other):
+        self.hist.merge(other.hist)
+        self.series.merge(other.series)
+        self.errors += other.errors
+        self.backlog += other.backlog
+        for query_class, h in other.classes.items():
+            self.classes.setdefault(query_class, LatencyHistogram()).merge(h)
+        self.cpu_usages.extend(other.cpu_usages)
+        self.prepare.merge(other.prepare)
+        self.pool_wait.merge(other.pool_wait)
+        return self
+
+# --- Statistics ---
+
+def median_ci(samples, confidence=0.95):
+    """
+    Distribution-free confidence interval of the median: order statistics whose ranks come from
+    Binomial(n, 1/2), exact for any latency distribution. Returns (low, high), or None when there
+    are too few samples for the confidence level (fewer than 6 at 95%).
+    """
+    n = len(samples)
+    alpha = (1 - confidence) / 2
+    tail = 0.0
+    rank = 0 # Largest rank with P(Binomial(n, 1/2) < rank) <= alpha
+    for k in range(n // 2 + 1):
+        tail += math.comb(n, k) / 2 ** n
+        if tail > alpha:
+            break
+        rank = k + 1
+    if rank == 0:
+        return None
+    data = sorted(samples)
+    return data[rank - 1], data[n - rank]
+
+def mann_whitney_u(x, y):
+    """
+    Two-sided Mann-Whitney U test, normal approximation with tie and continuity corrections.
+    Returns (U of x, p-value). Only meaningful with a few samples on each side (>= 5).
+    """
+    n1, n2 = len(x), len(y)
+    n = n1 + n2
+    combined = sorted([(v, 0) for v in x] + [(v, 1) for v in y])
+    rank_sum_x = 0.0
+    ties = 0.0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        avg_rank = (i + j) / 2 + 1 # Ties share the average of their ranks
+        rank_sum_x += avg_rank * sum(1 for k in range(i, j + 1) if combined[k][1] == 0)
+        ties += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+    u = rank_sum_x - n1 * (n1 + 1) / 2
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))) if n > 1 else 0
+    if sigma == 0:
+        return u, 1.0
+    z = max(abs(u - n1 * n2 / 2) - 0.5, 0) / sigma
+    return u, min(1.0, math.erfc(z / math.sqrt(2)))
+
+def benjamini_hochberg(p_values):
+    """False discovery rate adjusted p-values, in the input order"""
+    m = len(p_values)
+    order = sorted(range(m), key=lambda i: p_values[i], reverse=True)
+    adjusted = [0.0] * m
+    running = 1.0
+    for rank, i in zip(range(m, 0, -1), order):
+        running = min(running, p_values[i] * m / rank)
+        adjusted[i] = running
+    return adjusted
+
+# --- Result Fingerprint ---
+
+class ResultFingerprint:
+    """
+    Streaming, type-aware hash of a result set, to compare OpenHalo and MySQL
+    results without keeping the rows.
+    Values are normalized first (NULL, numbers whatever their driver type/scale,
+    bytes, dates) and each row is hashed. Without a top-level ORDER BY the row
+    hashes are summed (order-insensitive multiset hash), otherwise they are chained.
+    """
+
+    MASK = (1 << 64) - 1
+    SCALE = Decimal('0.0001') # MySQL default div_precision_increment (4)
+
+    def __init__(self, ordered=False, deterministic=True):
+        self.ordered = ordered
+        self.deterministic = deterministic
+        self.count = 0
+        self.value = 0
+
+    @classmethod
+    def for_query(cls, query):
+        """Fingerprint adapted to a query: ordered if it has a top-level ORDER BY,
+        non-comparable if it has a LIMIT without one (any rows can be returned)"""
+        q = " ".join(query.upper().split())
+        # ORDER BY in a subquery or an OVER (...) clause does not order the result
+        ordered = False
+        depth, prev = 0, None
+        for m in SQL_TOKEN_RE.finditer(q):
+            token = m.group(0)
+            if token == '(':
+                depth += 1
+            elif token == ')':
+                depth -= 1
+            elif token == 'BY' and prev == 'ORDER' and depth == 0:
+                ordered = True
+            prev = token
+        return cls(ordered=ordered, deterministic=ordered or " LIMIT " not in q)
+
+    @staticmethod
+    def normalize(value):
+        if value is None:
+            return "\\N"
+        if isinstance(value, bool):
+            return str(int(value))
+        if isinstance(value, float) and not math.isfinite(value):
+            return str(value)
+        if isinstance(value, Decimal) and not value.is_finite(): # NUMERIC 'NaN' / 'Infinity' (PostgreSQL)
+            return 'nan' if value.is_nan() else str(float(value)) # Same text as the float branch
+        if isinstance(value, (int, float, Decimal)):
+            # 1, 1.0 and Decimal('1.0000') are equal; AVG() scales differ between engines
+            # (MySQL 1955.3333, PostgreSQL 1955.3333333333333333): compared at MySQL's 4 decimals
+            if value == int(value) and abs(value) < 2 ** 53:
+                return str(int(value))
+            try:
+                return str(Decimal(str(value)).quantize(ResultFingerprint.SCALE, rounding=ROUND_HALF_UP))
+            except InvalidOperation: # Too many digits for the decimal context
+                return f"{float(value):.9g}"
+        if isinstance(value, (bytes, bytearray)):
+            return value.decode('utf-8', errors='replace')
+        if isinstance(value, (datetime.date, datetime.time, datetime.timedelta)):
+            return str(value)
+        return str(value)
+
+    def _row_hash(self, row):
+        data = "\x1f".join(self.normalize(v) for v in row).encode('utf-8')
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+    def update(self, rows):
+        """Adds a batch of rows (usable as on_rows callback of execute_query_streaming)"""
+        for row in rows:
+            h = self._row_hash(row)
+            if self.ordered:
+                chained = self.value.to_bytes(8, 'big') + h.to_bytes(8, 'big')
+                self.value = int.from_bytes(hashlib.blake2b(chained, digest_size=8).digest(), 'big')
+            else:
+                self.value = (self.value + h) & self.MASK
+            self.count += 1
+
+    def hexdigest(self):
+        """'ord'/'set' (or 'any' when not comparable):row count:hash"""
+        kind = 'ord' if self.ordered else ('set' if self.deterministic else 'any')
+        return f"{kind}:{self.count}:{self.value:016x}"
+
+# --- Connection Pool ---
+
+class ConnectionPool:
+    """
+    Pool of at most `size` connections to one target (MySQL protocol), opened on demand.
+    Health checks are lazy: a connection is pinged when it is handed out only if it has been idle
+    for more than health_check_interval seconds or its last use failed, never before every query.
+    With reset_session, the session state (variables, temporary tables, open transaction, prepared
+    statements) is reset when a connection is given back. The time spent waiting for a free
+    connection is recorded in wait_hist.
+    """
+
+    def __init__(self, config, size=10, health_check_interval=30.0, reset_session=True, autocommit=None):
+        self.config = config
+        self.size = size
+        self.health_check_interval = health_check_interval
+        self.reset_session = reset_session
+        self.autocommit = autocommit # Applied to new, reconnected and reset connections (None = driver default)
+        self.idle = [] # Used as a stack: the most recently used connections stay hot
+        self.waiters = collections.deque() # Threads waiting for a connection, oldest first
+        self.opened = 0
+        self.state = {} # id(conn) -> {'last_used', 'suspect', 'data'}
+        self.wait_hist = LatencyHistogram()
+        self.health_checks = 0
+        self.reconnects = 0
+        self.lock = threading.Lock()
+
+    def _open(self):
+        conn = mysql.connector.connect(**self.config)
+        if self.autocommit is not None:
+            conn.autocommit = self.autocommit
+        self.state[id(conn)] = {'last_used': time.perf_counter(), 'suspect': False, 'data': {}}
+        return conn
+
+    def owns(self, conn):
+        return id(conn) in self.state
+
+    def adopt(self, conn):
+        """Health-checks a connection opened elsewhere (e.g. a sandbox session) the same lazy way; it is never handed out"""
+        self.state.setdefault(id(conn), {'last_used': time.perf_counter(), 'suspect': False, 'data': {}})
+
+    def session_data(self, conn):
+        """Client-side state bound to the server session of conn (e.g. prepared handles), dropped on reset or reconnect"""
+        return self.state[id(conn)]['data']
+
+    def sessions(self):
+        return [st['data'] for st in self.state.values()]
+
+    def acquire(self, timeout=None, record_wait=True):
+        """
+        Returns a healthy connection. When all `size` connections are in use, waits for one to be
+        released; waiters are served in arrival order, so a busy thread cannot starve the others.
+        """
+        start = time.perf_counter()
+        waiter = None
+        with self.lock:
+            if self.idle:
+                conn = self.idle.pop()
+            elif self.opened < self.size:
+                self.opened += 1
+                conn = None
+            else:
+                waiter = {'event': threading.Event(), 'conn': None}
+                self.waiters.append(waiter)
+
+        if waiter:
+            waiter['event'].wait(timeout)
+            with self.lock:
+                conn = waiter['conn']
+                if conn is None:
+                    self.waiters.remove(waiter)
+                    raise RuntimeError(f"No free connection in the pool after {timeout}s ({self.size} in use)")
+        elif conn is None:
+            try:
+                conn = self._open()
+            except Exception:
+                with self.lock:
+                    self.opened -= 1
+                raise
+            start = time.perf_counter() # Opening a connection is not waiting for one
+
+        if record_wait:
+            with self.lock:
+                self.wait_hist.record((time.perf_counter() - start) * 1000)
+        try:
+            self.check(conn)
+        except Exception:
+            self.release(conn, broken=True) # Stays in the pool, checked again next time
+            raise
+        return conn
+
+    def check(self, conn):
+        """Lazy health check: ping only after a failure or a long idle period"""
+        st = self.state.get(id(conn))
+        if st is None:
+            return
+        now = time.perf_counter()
+        if st['suspect'] or now - st['last_used'] > self.health_check_interval:
+            with self.lock:
+                self.health_checks += 1
+            try:
+                conn.ping(reconnect=False)
+            except Exception:
+                # The session is gone: reconnect in place, its state is lost
+                conn.ping(reconnect=True, attempts=3, delay=1)
+                st['data'].clear()
+                if self.autocommit is not None:
+                    conn.autocommit = self.autocommit
+                with self.lock:
+                    self.reconnects += 1
+        st['suspect'] = False
+        st['last_used'] = now
+
+    def flag(self, conn):
+        """Marks conn for a health check before its next use (after an error)"""
+        st = self.state.get(id(conn))
+        if st:
+            st['suspect'] = True
+
+    def release(self, conn, broken=False):
+        st = self.state[id(conn)]
+        if broken:
+            st['suspect'] = True
+        elif self.reset_session:
+            try:
+                conn.reset_session() # COM_RESET_CONNECTION, no re-authentication
+                st['data'].clear()
+                if self.autocommit is not None:
+                    conn.autocommit = self.autocommit
+            except Exception:
+                st['suspect'] = True
+        st['last_used'] = time.perf_counter()
+        with self.lock:
+            if self.waiters:
+                # Handed over to the oldest waiter
+                waiter = self.waiters.popleft()
+                waiter['conn'] = conn
+                waiter['event'].set()
+            else:
+                self.idle.append(conn)
+
+    def stats(self):
+        return {"size": self.size, "opened": self.opened, "health_checks": self.health_checks,
+                "reconnects": self.reconnects, "waits": self.wait_hist.count,
+                "avg_wait": self.wait_hist.mean(), "p95_wait": self.wait_hist.percentile(95),
+                "p99_wait": self.wait_hist.percentile(99), "max_wait": self.wait_hist.max}
+
+    def close(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for conn in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
 
 # --- Dual Database Connector ---
 
 class DualDatabaseConnector:
-    """Manages connections to both OpenHalo and standard MySQL."""
-    def __init__(self, openhalo_config: Dict, mysql_config: Dict):
+    """
+    Manages connections to both OpenHalo and standard MySQL.
+    openhalo_conn / mysql_conn are the sessions of the suite, taken from one pool per target
+    (pool_size connections, including that session). The suite's tests rely on the session state
+    from one test to the next (variables, transactions), so these pools do not reset sessions.
+    """
+    def __init__(self, openhalo_config: Dict, mysql_config: Dict, pool_size: int = 1,
+                 health_check_interval: float = 30.0, pg_config: Dict = None):
         self.openhalo_config = openhalo_config
         self.mysql_config = mysql_config
+        # Optional third target: the OpenHalo backend over the native PostgreSQL protocol (psycopg2)
+        self.pg_config = pg_config
+        self.pg_conn = None
+        self.pg_idle = [] # Native PostgreSQL connections of parallel workers (see acquire_sessions)
+        self.pool_size = pool_size
+        self.health_check_interval = health_check_interval
+        self.pools: Dict[str, ConnectionPool] = {}
+        # Connections the pools do not own (sandbox sessions): same lazy health checks
+        self.adopted = self._new_pool({})
         self.openhalo_conn = None
         self.mysql_conn = None
+
+    def _new_pool(self, config):
+        # autocommit off: important for transaction tests
+        return ConnectionPool(config, self.pool_size, self.health_check_interval, reset_session=False, autocommit=False)
+
+    def check(self, conn):
+        """Lazy health check of a suite connection before a statement (see ConnectionPool.check)"""
+        for pool in self.pools.values():
+            if pool.owns(conn):
+                pool.check(conn)
+                return
+        if not is_postgres_conn(conn): # psycopg2 has no ping: errors show up on the query itself
+            self.adopted.adopt(conn)
+            self.adopted.check(conn)
+
+    def flag(self, conn):
+        """A statement failed on conn: it is health-checked before its next statement"""
+        for pool in list(self.pools.values()) + [self.adopted]:
+            pool.flag(conn)
+
+    def sessions(self) -> Dict:
+        """Suite sessions by target name"""
+        sessions = {'OpenHalo': self.openhalo_conn, 'MySQL': self.mysql_conn, PG_TARGET: self.pg_conn}
+        return {target: conn for target, conn in sessions.items() if conn}
+
+    def acquire_sessions(self) -> Dict:
+        """
+        Additional sessions by target name, for a parallel worker (the pools need pool_size > 1).
+        Targets the suite is not connected to are left out.
+        """
+        sessions = {}
+        try:
+            for target, pool in self.pools.items():
+                if target == 'MySQL' and not self.mysql_conn:
+                    continue
+                sessions[target] = pool.acquire()
+            if self.pg_conn:
+                try:
+                    sessions[PG_TARGET] = self.pg_idle.pop()
+                except IndexError:
+                    sessions[PG_TARGET] = connect_target(self.pg_config, 'postgres')
+                    sessions[PG_TARGET].autocommit = True
+        except Exception:
+            self.release_sessions(sessions)
+            raise
+        return sessions
+
+    def release_sessions(self, sessions: Dict):
+        for target, conn in sessions.items():
+            if target == PG_TARGET:
+                self.pg_idle.append(conn)
+                continue
+            try:
+                conn.rollback() # Ends the read snapshot: the next user sees the latest committed data
+                self.pools[target].release(conn)
+            except Exception:
+                self.pools[target].release(conn, broken=True)
     
     def connect(self):
         """Establish connections."""
         print("Attempting to connect to OpenHalo...")
         try:
-            self.openhalo_conn = mysql.connector.connect(**self.openhalo_config)
-            self.openhalo_conn.autocommit = False # Important for transaction tests
+            self.pools['OpenHalo'] = self._new_pool(self.openhalo_config)
+            self.openhalo_conn = self.pools['OpenHalo'].acquire(record_wait=False)
             print("✓ Connected to OpenHalo (Port: {})".format(self.openhalo_config['port']))
         except Exception as e:
             print(f"✗ OpenHalo connection failed: {e}")
@@ -56,12 +558,23 @@ class DualDatabaseConnector:
             
         print("Attempting to connect to MySQL...")
         try:
-            self.mysql_conn = mysql.connector.connect(**self.mysql_config)
-            self.mysql_conn.autocommit = False
+            self.pools['MySQL'] = self._new_pool(self.mysql_config)
+            self.mysql_conn = self.pools['MySQL'].acquire(record_wait=False)
             print("✓ Connected to MySQL (Port: {})".format(self.mysql_config['port']))
         except Exception as e:
             print(f"✗ MySQL connection failed: {e}")
             print("Warning: Continuing tests with OpenHalo only.")
+
+        if self.pg_config:
+            print("Attempting to connect to PostgreSQL (OpenHalo backend)...")
+            try:
+                self.pg_conn = connect_target(self.pg_config, 'postgres')
+                # Read-only queries only; a failed query must not abort the following ones
+                self.pg_conn.autocommit = True
+                print("✓ Connected to PostgreSQL (Port: {})".format(self.pg_config.get('port')))
+            except Exception as e:
+                print(f"✗ PostgreSQL connection failed: {e}")
+                print("Warning: Continuing without the native PostgreSQL baseline.")
     
     def close(self):
         # Protect OpenHalo connection closure
@@ -80,6 +593,250 @@ class DualDatabaseConnector:
             except:
                 pass
 
+        if self.pg_conn:
+            try:
+                self.pg_conn.close()
+                print("Closed PostgreSQL connection.")
+            except:
+                pass
+        for conn in self.pg_idle:
+            try:
+                conn.close()
+            except:
+                pass
+
+        # Other pooled connections, if any
+        for pool in self.pools.values():
+            pool.close()
+
+def connect_target(config, dialect='mysql'):
+    """Opens a connection over the MySQL protocol (mysql-connector) or the PostgreSQL protocol (psycopg2)"""
+    if dialect == 'postgres':
+        if psycopg2 is None:
+            raise RuntimeError("psycopg2 is required for PostgreSQL protocol connections (pip install psycopg2-binary)")
+        return psycopg2.connect(**config)
+    return mysql.connector.connect(**config)
+
+# --- Prepared Statements ---
+
+ER_UNSUPPORTED_PS = 1295 # "This command is not supported in the prepared statement protocol yet"
+
+# Only these statements get their literals turned into parameters
+PARAMETERIZED_STATEMENTS = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE', '(')
+# Tokens: strings, quoted identifiers, numbers, words, and the punctuation that delimits clauses
+SQL_TOKEN_RE = re.compile(r"""'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.)*"|`[^`]*`|\d+(?:\.\d+)?(?:[eE][-+]?\d+)?|[A-Za-z_@][\w$@.]*|[(),;]""")
+# Numbers between parentheses after these words are type sizes (CAST(x AS CHAR(10))), not values
+SQL_TYPE_WORDS = {'CHAR', 'VARCHAR', 'DECIMAL', 'NUMERIC', 'BINARY', 'VARBINARY', 'FLOAT', 'DOUBLE', 'DATETIME', 'TIME', 'TIMESTAMP'}
+SQL_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '0': '\0', 'Z': '\x1a', 'b': '\b', '%': '\\%', '_': '\\_'}
+
+def _unquote_sql_string(literal):
+    body = literal[1:-1].replace("''", "'")
+    return re.sub(r"\\(.)", lambda m: SQL_ESCAPES.get(m.group(1), m.group(1)), body)
+
+def parameterize_query(query):
+    """
+    Replaces the literals of a SELECT / DML statement with ? placeholders, so that every execution
+    of the same statement shape reuses one prepared statement. Returns (sql, params).
+    Positional ORDER BY / GROUP BY numbers and type sizes stay literal; other statements are only
+    stripped of their trailing semicolon.
+
+    >>> parameterize_query("SELECT a FROM t WHERE b = 5 ORDER BY LENGTH(a) DESC, 2 LIMIT 10;")
+    ('SELECT a FROM t WHERE b = ? ORDER BY LENGTH(a) DESC, 2 LIMIT ?', (5, 10))
+    >>> parameterize_query("SELECT a FROM t WHERE x IN (SELECT y FROM u GROUP BY 1 HAVING COUNT(*) > 3) ORDER BY 1")
+    ('SELECT a FROM t WHERE x IN (SELECT y FROM u GROUP BY 1 HAVING COUNT(*) > ?) ORDER BY 1', (3,))
+    """
+    query = query.strip().rstrip(';').strip()
+    if not query.upper().startswith(PARAMETERIZED_STATEMENTS):
+        return query, ()
+
+    parts, params = [], []
+    last_end = 0
+    prev_word = None
+    positional = [] # Paren depths of the open ORDER BY / GROUP BY clauses
+    type_depth = 0 # Inside the parentheses of a type
+    depth = 0
+    for m in SQL_TOKEN_RE.finditer(query):
+        token = m.group(0)
+        upper = token.upper()
+        literal = None
+        if token[0] == "'":
+            literal = _unquote_sql_string(token)
+        elif token[0].isdigit():
+            if not positional and not type_depth:
+                literal = Decimal(token) if '.' in token or 'E' in upper else int(token)
+        elif token == '(':
+            depth += 1
+            if prev_word in SQL_TYPE_WORDS and not type_depth:
+                type_depth = depth
+        elif token == ')':
+            if type_depth == depth:
+                type_depth = 0
+            depth -= 1
+            # A function call in the clause (LENGTH(a)) does not end it, closing its subquery does
+            while positional and positional[-1] > depth:
+                positional.pop()
+        elif token == ';':
+            positional = []
+        elif token[0].isalpha() or token[0] in '_@':
+            if upper == 'BY' and prev_word in ('ORDER', 'GROUP'):
+                if not positional or positional[-1] != depth:
+                    positional.append(depth)
+            elif upper in ('LIMIT', 'HAVING', 'UNION', 'WINDOW', 'FOR', 'INTO', 'LOCK', 'OFFSET'):
+                if positional and positional[-1] == depth:
+                    positional.pop()
+            prev_word = upper
+            continue
+        prev_word = None
+        if literal is not None:
+            parts.append(query[last_end:m.start()])
+            parts.append('?')
+            params.append(literal)
+            last_end = m.end()
+    parts.append(query[last_end:])
+    return "".join(parts), tuple(params)
+
+def measure_prepare(conn, sql):
+    """Time (ms) of one COM_STMT_PREPARE round trip for sql; the statement is closed right after"""
+    start = time.perf_counter()
+    stmt = conn.cmd_stmt_prepare(sql.encode('utf-8'))
+    elapsed = (time.perf_counter() - start) * 1000
+    # Pure Python connector: dict with the statement id, C extension: statement object
+    conn.cmd_stmt_close(stmt['statement_id'] if isinstance(stmt, dict) else stmt)
+    return elapsed
+
+class PreparedStatementCache:
+    """
+    Prepared cursors (server-side statement handles over the binary protocol) of one connection,
+    one per statement shape, reused for every execution of that shape.
+    A new shape is prepared on its cursor before any execution and that round trip is timed on
+    its own, so the execution times do not include it. If the parameterized form cannot be
+    prepared (e.g. a literal where the server does not accept a placeholder), the statement is
+    prepared with its literals.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.handles = {} # shape -> [cursor, sql sent, parameterized, cursor-side prepare still pending]
+        self.prepare_hist = LatencyHistogram()
+
+    def _prepare_cursor(self, cursor, sql, placeholders):
+        """Prepares sql on cursor, returns (prepare ms, pending)"""
+        if not placeholders:
+            # The connector has no prepare-only call: the cursor prepares on its first execution
+            return measure_prepare(self.conn, sql), True
+        start = time.perf_counter()
+        cursor.execute(sql) # Placeholders without values: the connector prepares and does not execute
+        return (time.perf_counter() - start) * 1000, False
+
+    def prepare(self, query):
+        """Creates the handle of the statement shape of query if needed, returns (shape, params)"""
+        shape, params = parameterize_query(query)
+        if shape not in self.handles:
+            sql = shape
+            cursor = self.conn.cursor(prepared=True)
+            try:
+                try:
+                    prepare_ms, pending = self._prepare_cursor(cursor, sql, bool(params))
+                except mysql.connector.Error:
+                    if not params:
+                        raise
+                    sql = query.strip().rstrip(';').strip()
+                    prepare_ms, pending = self._prepare_cursor(cursor, sql, False)
+            except Exception:
+                cursor.close()
+                raise
+            self.prepare_hist.record(prepare_ms)
+            # The connector reuses its statement only when it gets the same string object again
+            self.handles[shape] = [cursor, sql, sql is shape, pending]
+        return shape, params
+
+    def get(self, query):
+        """
+        Returns (cursor, sql, params, pending) for query. pending is only set for the first
+        execution of a handle without parameters, which also prepares on the cursor side.
+        """
+        shape, params = self.prepare(query)
+        handle = self.handles[shape]
+        cursor, sql, parameterized, pending = handle
+        handle[3] = False
+        return cursor, sql, params if parameterized else (), pending
+
+    def execute(self, query):
+        """Executes query on its prepared handle and returns the cursor (rows still to be fetched)"""
+        cursor, sql, params, _ = self.get(query)
+        cursor.execute(sql, params)
+        return cursor
+
+    def close(self):
+        for cursor, *_ in self.handles.values():
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        self.handles = {}
+
+# --- PostgreSQL Dialect ---
+
+PG_TARGET = 'PostgreSQL' # Native PostgreSQL protocol on the OpenHalo backend
+
+# MySQL function -> PostgreSQL equivalent
+PG_FUNCTIONS = {'IFNULL': 'COALESCE', 'RAND': 'RANDOM', 'LCASE': 'LOWER', 'UCASE': 'UPPER',
+                'DATABASE': 'CURRENT_DATABASE', 'CHAR_LENGTH': 'LENGTH'}
+# Only meaningful (or only valid) in MySQL
+PG_UNSUPPORTED = {'OUTFILE', 'DUMPFILE', 'STRAIGHT_JOIN', 'SQL_CALC_FOUND_ROWS', 'SQL_NO_CACHE', 'HIGH_PRIORITY',
+                  'SEPARATOR', 'REGEXP', 'RLIKE', 'DIV', 'XOR', 'SOUNDS'}
+
+def to_postgres_dialect(query):
+    """
+    PostgreSQL version of a read-only MySQL query, or None when there is none.
+    Mechanical rewrites only: identifier quoting, string literals, LIMIT offset, a few functions.
+    Writes and DDL are not translated: native PG runs on the same data as OpenHalo, so they
+    would be applied twice.
+    """
+    query = query.strip().rstrip(';').strip()
+    if not query.upper().startswith(('SELECT', 'WITH', '(')):
+        return None
+
+    parts = []
+    last_end = 0
+    prev_word = None
+    for m in SQL_TOKEN_RE.finditer(query):
+        token = m.group(0)
+        upper = token.upper()
+        replacement = None
+        if token[0] == '`':
+            name = token[1:-1]
+            # Unquoted names are folded to lower case by PostgreSQL, like the columns of the dump
+            replacement = name.lower() if re.fullmatch(r'\w+', name) else '"' + name.replace('"', '""') + '"'
+        elif token[0] in ("'", '"'):
+            # PostgreSQL strings: no backslash escapes, double quotes are identifiers
+            replacement = "'" + _unquote_sql_string("'" + token[1:-1] + "'").replace("'", "''") + "'"
+        elif token[0] == '@' or upper in PG_UNSUPPORTED or upper in ('INSERT', 'DELETE', 'INTO'):
+            return None
+        elif upper == 'UPDATE' and prev_word != 'FOR':
+            return None
+        elif upper in PG_FUNCTIONS:
+            replacement = PG_FUNCTIONS[upper]
+        if token[0].isalpha() or token[0] == '_':
+            prev_word = upper
+        if replacement is not None:
+            parts.append(query[last_end:m.start()])
+            parts.append(replacement)
+            last_end = m.end()
+    parts.append(query[last_end:])
+    sql = "".join(parts)
+
+    # LIMIT offset, count -> LIMIT count OFFSET offset
+    sql = re.sub(r"\bLIMIT\s+(\d+)\s*,\s*(\d+)", r"LIMIT \2 OFFSET \1", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bCURDATE\(\s*\)", "CURRENT_DATE", sql, flags=re.IGNORECASE)
+    return sql
+
+def is_postgres_conn(conn):
+    return psycopg2 is not None and isinstance(conn, psycopg2.extensions.connection)
+
+# Errors of a statement on any target
+DB_ERRORS = (mysql.connector.Error, psycopg2.Error) if psycopg2 else (mysql.connector.Error,)
+
 # --- Schema Inspector ---
 
 import random
@@ -94,7 +851,11 @@ class DynamicQueryBuilder:
         'name_basics': {
             'columns': ['nconst', 'primaryname', 'birthyear', 'deathyear', 'primaryprofession', 'knownfortitles'],
             'numeric': ['birthyear', 'deathyear'],
-            'string': ['nconst', 'primaryname', 'primaryprofession', 'knownfortitles']
+            'string': ['nconst', 'primaryname', 'primaryprofession', 'knownfortitles'],
+            # Primary key and its format in the IMDB dump (nm0000001 ... nm0010182)
+            'pk': 'nconst',
+            'pk_format': 'nm{:07d}',
+            'pk_max': 10182
         },
         'films': {
             'columns': ['film_id', 'title', 'release_year', 'rating', 'genre'],
@@ -257,6 +1018,25 @@ class DynamicQueryBuilder:
         query = f"SELECT * FROM {self.table} WHERE {num_col} > {sub} LIMIT {limit};"
         return f"Dyn Subquery (Compare to AVG)", query
 
+    def _get_random_key(self):
+        """Random primary key value in the range of the dataset"""
+        if 'pk_format' not in self.meta:
+            raise ValueError(f"No primary key format defined for {self.table}")
+        return "'" + self.meta['pk_format'].format(random.randint(1, self.meta['pk_max'])) + "'"
+
+    def build_point_lookup(self):
+        """Generates a primary key lookup (single row)"""
+        pk = self.meta['pk']
+        return "Dyn Point Lookup", f"SELECT * FROM {self.table} WHERE {pk} = {self._get_random_key()};"
+
+    def build_range_scan(self, limit=100):
+        """Generates a primary key range scan"""
+        pk = self.meta['pk']
+        start = random.randint(1, max(self.meta['pk_max'] - limit, 1))
+        low = "'" + self.meta['pk_format'].format(start) + "'"
+        high = "'" + self.meta['pk_format'].format(start + limit) + "'"
+        return "Dyn Range Scan", f"SELECT * FROM {self.table} WHERE {pk} BETWEEN {low} AND {high} ORDER BY {pk} LIMIT {limit};"
+
     def build_dml_lifecycle(self):
         """
         Generates a suite INSERT -> UPDATE -> SELECT -> DELETE.
@@ -286,57 +1066,1276 @@ class DynamicQueryBuilder:
         
         return steps
 
+# --- Dump Loader ---
+
+def iter_sql_dump(path, copy_batch_rows=10000):
+    """
+    Streams a mysqldump or pg_dump file without reading it into memory.
+    Yields ('sql', statement) for each statement, and ('copy', copy statement, lines)
+    for each batch of at most copy_batch_rows data lines of a COPY ... FROM stdin block.
+    Comments and psql meta-commands (\\restrict...) are skipped.
+    """
+    statement = []
+    copy_sql, copy_lines = None, []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if copy_sql is not None:
+                if line.startswith('\\.'):
+                    if copy_lines:
+                        yield ('copy', copy_sql, copy_lines)
+                    copy_sql, copy_lines = None, []
+                else:
+                    copy_lines.append(line)
+                    if len(copy_lines) >= copy_batch_rows:
+                        yield ('copy', copy_sql, copy_lines)
+                        copy_lines = []
+                continue
+
+            if not statement and (not line.strip() or line.startswith('--') or line.startswith('\\')):
+                continue
+            statement.append(line)
+            if line.rstrip().endswith(';'):
+                sql = "".join(statement).strip()
+                statement = []
+                if sql.upper().startswith('COPY ') and sql.upper().endswith('FROM STDIN;'):
+                    copy_sql = sql.rstrip(';')
+                else:
+                    yield ('sql', sql)
+
+class DumpLoader:
+    """
+    Loads a SQL dump into one target: DDL and session statements run in order on one
+    connection, the data statements (INSERT batches, COPY blocks) are spread over a pool
+    of `workers` connections. The file is streamed through a bounded queue.
+    """
+
+    # mysqldump statements that would serialize the parallel load
+    SKIPPED = ('LOCK TABLES', 'UNLOCK TABLES', '/*!40000 ALTER TABLE')
+
+    def __init__(self, config, dump_path, dialect='mysql', workers=4, copy_batch_rows=10000):
+        self.config = config
+        self.dump_path = dump_path
+        self.dialect = dialect
+        self.workers = workers
+        self.copy_batch_rows = copy_batch_rows
+        self.session_statements = [] # SET ... replayed on every pool connection
+        self.rows = 0
+        self.errors = 0
+        self.first_error = None
+        self.lock = threading.Lock()
+
+    def _is_data(self, item):
+        return item[0] == 'copy' or item[1].upper().startswith(('INSERT', 'REPLACE'))
+
+    def _is_session_statement(self, sql):
+        # /*!40101 SET ... */ or SET ... or SELECT pg_catalog.set_config(...)
+        upper = sql.upper()
+        return upper.startswith('SET ') or (upper.startswith('/*!') and ' SET ' in upper) or 'SET_CONFIG(' in upper
+
+    def _record_error(self, e):
+        with self.lock:
+            self.errors += 1
+            if self.first_error is None:
+                self.first_error = str(e).splitlines()[0][:150]
+
+    def _execute(self, conn, cursor, item):
+        """Runs one dump item and returns the number of rows it loaded"""
+        if item[0] == 'copy':
+            cursor.copy_expert(item[1], io.StringIO("".join(item[2])))
+            loaded = len(item[2])
+        else:
+            cursor.execute(item[1])
+            loaded = max(cursor.rowcount, 0) if self._is_data(item) else 0
+        conn.commit()
+        return loaded
+
+    def _open_sessions(self):
+        """
+        Opens the pool connections up front, with the session statements seen so far:
+        a connection failure aborts the load instead of leaving the queue undrained.
+        """
+        sessions = []
+        try:
+            for _ in range(self.workers):
+                conn = connect_target(self.config, self.dialect)
+                sessions.append((conn, conn.cursor()))
+        except Exception:
+            self._close_sessions(sessions)
+            raise
+        for sql in self.session_statements:
+            self._replay(sessions, sql)
+        return sessions
+
+    def _replay(self, sessions, sql):
+        for _, cursor in sessions:
+            try:
+                cursor.execute(sql)
+            except Exception:
+                pass
+
+    def _close_sessions(self, sessions):
+        for conn, cursor in sessions:
+            try:
+                cursor.close()
+                conn.close()
+            except Exception:
+                pass
+
+    def _worker(self, items, conn, cursor):
+        # Drains the queue until the sentinel whatever happens, so load() never blocks on it
+        while True:
+            item = items.get()
+            if item is None:
+                items.task_done()
+                break
+            try:
+                loaded = self._execute(conn, cursor, item)
+                with self.lock:
+                    self.rows += loaded
+            except Exception as e:
+                self._record_error(e)
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+            items.task_done()
+
+    def load(self, target_name):
+        print(f"\n📥 LOADING {os.path.basename(self.dump_path)} into {target_name} ({self.workers} connections)")
+        start = time.perf_counter()
+        size = os.path.getsize(self.dump_path)
+
+        conn = connect_target(self.config, self.dialect)
+        cursor = conn.cursor()
+        items = queue.Queue(maxsize=self.workers * 2) # Bounded: the file is never fully in memory
+        sessions, pool = [], []
+
+        try:
+            for item in iter_sql_dump(self.dump_path, self.copy_batch_rows):
+                if self._is_data(item):
+                    if not pool:
+                        sessions = self._open_sessions()
+                        pool = [threading.Thread(target=self._worker, args=(items, c, cur)) for c, cur in sessions]
+                        for t in pool:
+                            t.start()
+                    items.put(item)
+                    continue
+
+                sql = item[1]
+                if sql.upper().startswith(self.SKIPPED):
+                    continue
+                # DDL after data (constraints, next table) waits for the pending batches
+                items.join()
+                if self._is_session_statement(sql):
+                    self.session_statements.append(sql)
+                    # The workers are idle after join(): safe to use their connections from here
+                    self._replay(sessions, sql)
+                try:
+                    self._execute(conn, cursor, item)
+                except Exception as e:
+                    conn.rollback()
+                    self._record_error(e)
+        finally:
+            for _ in pool:
+                items.put(None)
+            for t in pool:
+                t.join()
+            self._close_sessions(sessions + [(conn, cursor)])
+
+        elapsed = time.perf_counter() - start
+        rows_per_sec = self.rows / elapsed if elapsed > 0 else 0
+        print(f"  ➜ {target_name}: {self.rows} rows in {elapsed:.2f}s → {rows_per_sec:.0f} rows/sec "
+              f"({size / 1e6 / elapsed:.2f} MB/s), errors: {self.errors}")
+        if self.first_error:
+            print(f"  ➜ First error: {self.first_error}")
+        return {"rows": self.rows, "seconds": elapsed, "rows_per_sec": rows_per_sec,
+                "mb_per_sec": size / 1e6 / elapsed if elapsed > 0 else 0, "errors": self.errors}
+
+def load_dumps_concurrently(jobs, workers=4):
+    """
+    Loads several targets at the same time.
+    jobs: {target name: (config, dump path, dialect)}, returns {target name: load stats}
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = {name: executor.submit(DumpLoader(config, path, dialect, workers).load, name)
+                   for name, (config, path, dialect) in jobs.items()}
+        return {name: f.result() for name, f in futures.items()}
+
+# --- Synthetic Data Generator ---
+
+class SyntheticDataGenerator:
+    """
+    Seeded generator for name_basics, films and film_actor at a scale factor (1x = 10,000 people,
+    the size of the IMDB dump; 1000x = 10M). Every batch gets its own RNG derived from
+    (seed, table, batch number), so the data is identical whatever the batch order or the number
+    of workers, and both targets receive the same rows.
+    """
+
+    PEOPLE_PER_SCALE = 10000
+    FILMS_PER_SCALE = 2000
+    BATCH_ROWS = 2000
+
+    # Weights roughly follow the IMDB name.basics distribution
+    PROFESSIONS = {'actor': 30, 'actress': 22, 'producer': 9, 'writer': 9, 'director': 8, 'miscellaneous': 6,
+                   'camera_department': 4, 'composer': 3, 'editor': 3, 'soundtrack': 2, 'cinematographer': 2,
+                   'music_department': 1, 'archive_footage': 1}
+    GENRES = {'Drama': 30, 'Comedy': 20, 'Documentary': 12, 'Action': 9, 'Thriller': 8, 'Romance': 7,
+              'Horror': 6, 'Crime': 5, 'Animation': 3}
+    ROLES = ['Lead', 'Supporting', 'Cameo', 'Voice']
+    FIRST_NAMES = ['James', 'Mary', 'John', 'Patricia', 'Robert', 'Jennifer', 'Michael', 'Linda', 'David',
+                   'Elizabeth', 'Jean', 'Marie', 'Pierre', 'Sophie', 'Hans', 'Anna', 'Kenji', 'Yuki', 'Carlos',
+                   'Lucia', 'Ahmed', 'Fatima', 'Ivan', 'Olga', 'Raj', 'Priya']
+    LAST_NAMES = ['Smith', 'Johnson', 'Brown', 'Garcia', 'Miller', 'Martin', 'Bernard', 'Dubois', 'Muller',
+                  'Schmidt', 'Rossi', 'Tanaka', 'Sato', 'Lopez', 'Silva', 'Ivanov', 'Khan', 'Patel', 'Kim',
+                  'Nguyen', 'Cohen', 'Andersen']
+    TITLE_WORDS = ['Night', 'River', 'Shadow', 'Summer', 'Silent', 'Last', 'Golden', 'Broken', 'City', 'Storm',
+                   'Love', 'Winter', 'Secret', 'Road', 'Fire', 'Glass']
+    CURRENT_YEAR = 2025
+
+    DDL = [
+        "DROP TABLE IF EXISTS film_actor",
+        "DROP TABLE IF EXISTS films",
+        "DROP TABLE IF EXISTS name_basics",
+        """CREATE TABLE name_basics (nconst VARCHAR(20) NOT NULL, primaryName VARCHAR(255) NOT NULL,
+            birthYear INT DEFAULT NULL, deathYear INT DEFAULT NULL, primaryProfession VARCHAR(255) DEFAULT NULL,
+            knownForTitles VARCHAR(255) DEFAULT NULL, PRIMARY KEY (nconst))""",
+        """CREATE TABLE films (film_id VARCHAR(20) NOT NULL, title VARCHAR(255), release_year INT,
+            rating DECIMAL(3,1), genre VARCHAR(50), PRIMARY KEY (film_id))""",
+        """CREATE TABLE film_actor (nconst VARCHAR(20) NOT NULL, film_id VARCHAR(20) NOT NULL,
+            role VARCHAR(50))""",
+    ]
+    # Secondary indexes are built once the data is in, which is faster than maintaining them per batch
+    POST_LOAD_DDL = [
+        "CREATE INDEX idx_film_actor_nconst ON film_actor (nconst)",
+        "CREATE INDEX idx_film_actor_film ON film_actor (film_id)",
+    ]
+
+    INSERTS = {
+        'name_basics': "INSERT INTO name_basics (nconst, primaryName, birthYear, deathYear, primaryProfession, knownForTitles) VALUES (%s, %s, %s, %s, %s, %s)",
+        'films': "INSERT INTO films (film_id, title, release_year, rating, genre) VALUES (%s, %s, %s, %s, %s)",
+        'film_actor': "INSERT INTO film_actor (nconst, film_id, role) VALUES (%s, %s, %s)",
+    }
+
+    def __init__(self, scale=1, seed=42, workers=4):
+        if not 1 <= scale <= 1000:
+            raise ValueError("scale must be between 1 and 1000")
+        self.scale = scale
+        self.seed = seed
+        self.workers = workers
+        self.num_people = self.PEOPLE_PER_SCALE * scale
+        self.num_films = self.FILMS_PER_SCALE * scale
+
+    def _rng(self, table, batch):
+        return random.Random(f"{self.seed}:{table}:{batch}")
+
+    def _batches(self, total):
+        return [(start, min(start + self.BATCH_ROWS, total)) for start in range(0, total, self.BATCH_ROWS)]
+
+    def film_rows(self, start, end):
+        rng = self._rng('films', start)
+        genres, weights = list(self.GENRES), list(self.GENRES.values())
+        rows = []
+        for i in range(start + 1, end + 1):
+            title = f"{rng.choice(self.TITLE_WORDS)} {rng.choice(self.TITLE_WORDS)} {i}" # Unique for md_10.1
+            # Skewed towards recent years, like the real catalogue
+            year = 1920 + int((self.CURRENT_YEAR - 1920) * rng.random() ** 0.6)
+            rating = Decimal(str(round(min(10.0, max(1.0, rng.gauss(6.3, 1.2))), 1)))
+            rows.append((f"tt{i:07d}", title, year, rating, rng.choices(genres, weights)[0]))
+        return rows
+
+    def people_rows(self, start, end):
+        """Returns (name_basics rows, film_actor rows) for people start+1 .. end"""
+        rng = self._rng('name_basics', start)
+        professions, weights = list(self.PROFESSIONS), list(self.PROFESSIONS.values())
+        people, credits = [], []
+        for i in range(start + 1, end + 1):
+            nconst = f"nm{i:07d}"
+            name = f"{rng.choice(self.FIRST_NAMES)} {rng.choice(self.LAST_NAMES)}"
+
+            # 1 to 3 distinct professions, the first one being the main one
+            jobs = []
+            for _ in range(rng.choices([1, 2, 3], [35, 35, 30])[0]):
+                job = rng.choices(professions, weights)[0]
+                if job not in jobs:
+                    jobs.append(job)
+
+            # Birth year unknown for ~15% of people; death year NULL when still alive or unknown
+            birth = death = None
+            if rng.random() > 0.15:
+                birth = min(2010, max(1870, int(rng.gauss(1955, 22))))
+                lifespan = max(20, int(rng.gauss(76, 12)))
+                if birth + lifespan <= self.CURRENT_YEAR and rng.random() > 0.05:
+                    death = birth + lifespan
+
+            titles = [f"tt{t:07d}" for t in sorted(rng.sample(range(1, self.num_films + 1), rng.randint(1, 4)))]
+            people.append((nconst, name, birth, death, ",".join(jobs), ",".join(titles)))
+
+            # Acting credits are the known-for titles of actors and actresses
+            if jobs[0] in ('actor', 'actress'):
+                for film_id in titles:
+                    credits.append((nconst, film_id, rng.choice(self.ROLES)))
+        return people, credits
+
+    def _insert_worker(self, config, tasks, counts, lock):
+        conn = connect_target(config)
+        cursor = conn.cursor()
+        for table, start, end in tasks:
+            if table == 'films':
+                batches = {'films': self.film_rows(start, end)}
+            else:
+                people, credits = self.people_rows(start, end)
+                batches = {'name_basics': people, 'film_actor': credits}
+            for name, rows in batches.items():
+                if rows:
+                    cursor.executemany(self.INSERTS[name], rows) # Rewritten as a multi-row INSERT by the connector
+                    with lock:
+                        counts[name] += len(rows)
+            conn.commit()
+        cursor.close()
+        conn.close()
+
+    def load(self, config, target_name):
+        """Recreates the three tables on one target and fills them with `workers` connections"""
+        print(f"\n🧬 GENERATING scale {self.scale}x into {target_name} "
+              f"({self.num_people} people, {self.num_films} films, {self.workers} connections)")
+        start = time.perf_counter()
+
+        conn = connect_target(config)
+        cursor = conn.cursor()
+        for sql in self.DDL:
+            cursor.execute(sql)
+        conn.commit()
+
+        tasks = [('films', s, e) for s, e in self._batches(self.num_films)]
+        tasks += [('name_basics', s, e) for s, e in self._batches(self.num_people)]
+        counts = {name: 0 for name in self.INSERTS}
+        lock = threading.Lock()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self._insert_worker, config, tasks[i::self.workers], counts, lock)
+                       for i in range(self.workers)]
+            for f in futures:
+                f.result()
+
+        for sql in self.POST_LOAD_DDL:
+            cursor.execute(sql)
+        conn.commit()
+        cursor.close()
+        conn.close()
+
+        elapsed = time.perf_counter() - start
+        rows = sum(counts.values())
+        print(f"  ➜ {target_name}: {rows} rows ({counts['name_basics']} name_basics, {counts['films']} films, "
+              f"{counts['film_actor']} film_actor) in {elapsed:.2f}s → {rows / elapsed:.0f} rows/sec")
+        return {"scale": self.scale, "seed": self.seed, "rows": rows, "tables": counts,
+                "seconds": elapsed, "rows_per_sec": rows / elapsed if elapsed > 0 else 0}
+
+def generate_synthetic_dataset(targets, scale=1, seed=42, workers=4):
+    """
+    Fills every target with the same synthetic dataset at the same time.
+    targets: {target name: config}, returns {target name: load stats}
+    """
+    generator = SyntheticDataGenerator(scale, seed, workers)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        futures = {name: executor.submit(generator.load, config, name) for name, config in targets.items()}
+        results = {name: f.result() for name, f in futures.items()}
+    # Random lookups must now draw from the generated key range
+    DynamicQueryBuilder.SCHEMA['name_basics']['pk_max'] = generator.num_people
+    return results
+
+# --- Table Consistency Checker ---
+
+class TableConsistencyChecker:
+    """
+    Compares a table between OpenHalo and MySQL without dumping it client-side.
+    The table is split into key ranges; each engine computes a COUNT and a SUM of
+    per-row MD5 hashes per range (in SQL, several ranges in parallel) and only the
+    ranges that differ are fetched row by row (key + row hash) to find the culprits.
+    """
+
+    # Key column used for the ranges, and compared columns
+    TABLES = {
+        'name_basics': ('nconst', ['nconst', 'primaryname', 'birthyear', 'deathyear', 'primaryprofession', 'knownfortitles']),
+        'films': ('film_id', ['film_id', 'title', 'release_year', 'rating', 'genre']),
+        'film_actor': ('nconst', ['nconst', 'film_id', 'role'])
+    }
+
+    def __init__(self, openhalo_config, mysql_config, openhalo_dialect='mysql', chunk_size=100000,
+                 workers=4, max_drilldown_rows=20):
+        # OpenHalo can be checked through its MySQL port ('mysql' dialect) or
+        # directly on its PostgreSQL backend ('postgres' dialect, needs psycopg2)
+        self.targets = {
+            'OpenHalo': (openhalo_config, openhalo_dialect),
+            'MySQL': (mysql_config, 'mysql')
+        }
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.max_drilldown_rows = max_drilldown_rows
+
+    def _row_hash_sql(self, columns, dialect):
+        """Row representation hashed identically by both engines (NULL -> \\N)"""
+        if dialect == 'postgres':
+            fields = ", ".join(f"COALESCE({c}::text, '\\N')" for c in columns)
+            return f"md5(concat_ws('|', {fields}))"
+        fields = ", ".join(f"COALESCE({c}, '\\\\N')" for c in columns)
+        return f"MD5(CONCAT_WS('|', {fields}))"
+
+    def _checksum_sql(self, table, key, columns, dialect, lower, upper):
+        row_hash = self._row_hash_sql(columns, dialect)
+        # First 15 hex digits (60 bits) of the MD5 as an integer, summed exactly (DECIMAL / NUMERIC)
+        if dialect == 'postgres':
+            value = f"('x' || substr({row_hash}, 1, 15))::bit(60)::bigint"
+        else:
+            value = f"CAST(CONV(SUBSTRING({row_hash}, 1, 15), 16, 10) AS UNSIGNED)"
+        where, params = self._range_clause(key, lower, upper)
+        return f"SELECT COUNT(*), COALESCE(SUM({value}), 0) FROM {table}{where}", params
+
+    def _range_clause(self, key, lower, upper):
+        conditions, params = [], []
+        if lower is not None:
+            conditions.append(f"{key} >= %s")
+            params.append(lower)
+        if upper is not None:
+            conditions.append(f"{key} < %s")
+            params.append(upper)
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), tuple(params)
+
+    def _chunk_ranges(self, conn, table, key):
+        """Key ranges [lower, upper) of about chunk_size rows, walked on the key index of the reference (MySQL)"""
+        cursor = conn.cursor()
+        bounds = []
+        last = None
+        while True:
+            if last is None:
+                cursor.execute(f"SELECT {key} FROM {table} ORDER BY {key} LIMIT 1 OFFSET %s", (self.chunk_size,))
+            else:
+                cursor.execute(f"SELECT {key} FROM {table} WHERE {key} > %s ORDER BY {key} LIMIT 1 OFFSET %s",
+                               (last, self.chunk_size - 1))
+            row = cursor.fetchone()
+            cursor.fetchall()
+            if row is None:
+                break
+            last = row[0]
+            bounds.append(last)
+        cursor.close()
+        # First and last ranges are open so rows outside the reference key span are still compared
+        edges = [None] + bounds + [None]
+        return list(zip(edges[:-1], edges[1:]))
+
+    def _checksum_ranges(self, target, table, key, columns, ranges):
+        """Runs on one connection of one target: {range index: (count, sum)}"""
+        config, dialect = self.targets[target]
+        conn = connect_target(config, dialect)
+        cursor = conn.cursor()
+        sums = {}
+        try:
+            for index, (lower, upper) in ranges:
+                sql, params = self._checksum_sql(table, key, columns, dialect, lower, upper)
+                cursor.execute(sql, params)
+                count, total = cursor.fetchone()
+                sums[index] = (int(count), int(total))
+        finally:
+            cursor.close()
+            conn.close()
+        return target, sums
+
+    def _fetch_row_hashes(self, target, table, key, columns, lower, upper):
+        """{key: [row hashes]} of one range (drill-down only)"""
+        config, dialect = self.targets[target]
+        conn = connect_target(config, dialect)
+        cursor = conn.cursor()
+        where, params = self._range_clause(key, lower, upper)
+        cursor.execute(f"SELECT {key}, {self._row_hash_sql(columns, dialect)} FROM {table}{where}", params)
+        hashes = {}
+        for k, h in cursor.fetchall():
+            hashes.setdefault(str(k), []).append(h)
+        cursor.close()
+        conn.close()
+        return hashes
+
+    def _drill_down(self, table, key, columns, lower, upper):
+        """Lists the keys that differ inside one range"""
+        oh = self._fetch_row_hashes('OpenHalo', table, key, columns, lower, upper)
+        my = self._fetch_row_hashes('MySQL', table, key, columns, lower, upper)
+        diffs = []
+        for k in sorted(set(oh) | set(my)):
+            if k not in oh:
+                diffs.append((k, "missing on OpenHalo"))
+            elif k not in my:
+                diffs.append((k, "missing on MySQL"))
+            elif sorted(oh[k]) != sorted(my[k]):
+                diffs.append((k, "different content"))
+        return diffs
+
+    def check_table(self, table):
+        key, columns = self.TABLES[table]
+        print(f"\n🧮 CONSISTENCY CHECK: {table} (chunks of {self.chunk_size} rows on {key}, {self.workers} workers/engine)")
+        start = time.perf_counter()
+
+        ref_config, ref_dialect = self.targets['MySQL']
+        conn = connect_target(ref_config, ref_dialect)
+        ranges = list(enumerate(self._chunk_ranges(conn, table, key)))
+        conn.close()
+
+        # Both engines, each with `workers` connections, all at the same time
+        slices = [ranges[i::self.workers] for i in range(self.workers)]
+        sums = {'OpenHalo': {}, 'MySQL': {}}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2 * self.workers) as executor:
+            futures = [executor.submit(self._checksum_ranges, target, table, key, columns, part)
+                       for target in sums for part in slices if part]
+            for future in concurrent.futures.as_completed(futures):
+                target, part_sums = future.result()
+                sums[target].update(part_sums)
+
+        bad_ranges = [(i, r) for i, r in ranges if sums['OpenHalo'].get(i) != sums['MySQL'].get(i)]
+        oh_rows = sum(c for c, _ in sums['OpenHalo'].values())
+        my_rows = sum(c for c, _ in sums['MySQL'].values())
+        print(f"  ➜ Rows: OpenHalo={oh_rows} MySQL={my_rows} | Chunks: {len(ranges)} | "
+              f"Different chunks: {len(bad_ranges)} ({time.perf_counter() - start:.1f}s)")
+
+        diffs = []
+        for _, (lower, upper) in bad_ranges:
+            diffs.extend(self._drill_down(table, key, columns, lower, upper))
+        for k, reason in diffs[:self.max_drilldown_rows]:
+            print(f"    {key}={k:<15} {reason}")
+        if len(diffs) > self.max_drilldown_rows:
+            print(f"    ... {len(diffs) - self.max_drilldown_rows} more")
+        if not bad_ranges:
+            print("  ✅ Tables are identical")
+
+        return {
+            "table": table,
+            "rows": {"OpenHalo": oh_rows, "MySQL": my_rows},
+            "chunks": len(ranges),
+            "different_chunks": len(bad_ranges),
+            "differences": [{"key": k, "reason": reason} for k, reason in diffs]
+        }
+
+# --- Server Statistics ---
+
+class ServerStatsCollector:
+    """
+    Server-side statement statistics of one engine, snapshotted before and after each test on a
+    connection of its own (the test session is not touched):
+      - 'postgres' (OpenHalo backend over its PostgreSQL port): pg_stat_statements of the current
+        database (needs shared_preload_libraries = 'pg_stat_statements' and CREATE EXTENSION)
+      - 'mysql': performance_schema.events_statements_summary_by_digest of the current schema, plus
+        the InnoDB buffer pool counters, which are global: the server should be otherwise idle
+    The difference between two snapshots covers every statement of the test (warm-up included).
+    """
+
+    PG_SNAPSHOT = """
+        SELECT COALESCE(SUM(calls), 0), COALESCE(SUM(total_exec_time), 0), COALESCE(SUM(rows), 0),
+               COALESCE(SUM(shared_blks_hit), 0), COALESCE(SUM(shared_blks_read), 0)
+        FROM pg_stat_statements
+        WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+          AND query NOT LIKE '%pg_stat_statements%'"""
+
+    # SUM_TIMER_WAIT is in picoseconds
+    MYSQL_SNAPSHOT = """
+        SELECT COALESCE(SUM(COUNT_STAR), 0), COALESCE(SUM(SUM_TIMER_WAIT), 0) / 1e9, COALESCE(SUM(SUM_ROWS_EXAMINED), 0)
+        FROM performance_schema.events_statements_summary_by_digest
+        WHERE SCHEMA_NAME = DATABASE() AND (DIGEST_TEXT IS NULL OR DIGEST_TEXT NOT LIKE '%performance_schema%')"""
+
+    MYSQL_BUFFER_POOL = """
+        SELECT VARIABLE_NAME, VARIABLE_VALUE FROM performance_schema.global_status
+        WHERE VARIABLE_NAME IN ('Innodb_buffer_pool_read_requests', 'Innodb_buffer_pool_reads')"""
+
+    def __init__(self, config, dialect='mysql'):
+        self.config = config
+        self.dialect = dialect
+        self.conn = None
+        self.enabled = True
+        self.lock = threading.Lock() # One connection, shared by parallel tests
+
+    def snapshot(self):
+        """Cumulative counters, or None if the statistics are not available (collector disabled)"""
+        with self.lock:
+            return self._snapshot()
+
+    def _snapshot(self):
+        if not self.enabled:
+            return None
+        try:
+            if self.conn is None:
+                self.conn = connect_target(self.config, self.dialect)
+                self.conn.autocommit = True
+            cursor = self.conn.cursor()
+            if self.dialect == 'postgres':
+                cursor.execute(self.PG_SNAPSHOT)
+                calls, exec_ms, rows, hits, reads = (float(v) for v in cursor.fetchone())
+            else:
+                cursor.execute(self.MYSQL_SNAPSHOT)
+                calls, exec_ms, rows = (float(v) for v in cursor.fetchone())
+                cursor.execute(self.MYSQL_BUFFER_POOL)
+                status = {name: float(value) for name, value in cursor.fetchall()}
+                reads = status.get('Innodb_buffer_pool_reads', 0)
+                hits = status.get('Innodb_buffer_pool_read_requests', 0) - reads # Requests served from memory
+            cursor.close()
+            return {"calls": calls, "exec_ms": exec_ms, "rows": rows, "buffer_hits": hits, "buffer_reads": reads}
+        except Exception as e:
+            print(f"  ⚠ Server statistics disabled ({self.dialect}): {str(e).splitlines()[0][:100]}")
+            self.enabled = False
+            return None
+
+    def attach(self, result, before):
+        """Stores the server-side figures of the test in its QueryResult"""
+        after = self.snapshot()
+        if not before or not after:
+            return
+        delta = {k: after[k] - before[k] for k in after}
+        calls = max(delta['calls'], 0)
+        result.server_calls = int(calls)
+        result.server_time = delta['exec_ms'] / calls if calls else 0
+        result.server_rows = int(delta['rows'])
+        result.buffer_hits = int(delta['buffer_hits'])
+        result.buffer_reads = int(delta['buffer_reads'])
+
+    def close(self):
+        with self.lock:
+            if self.conn:
+                try:
+                    self.conn.close()
+                except Exception:
+                    pass
+
+# --- Query Plans ---
+
+def _mysql_plan_tables(node):
+    """Table accesses of a MySQL EXPLAIN FORMAT=JSON document"""
+    if isinstance(node, dict):
+        if 'table_name' in node and 'access_type' in node:
+            yield node
+        for value in node.values():
+            yield from _mysql_plan_tables(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _mysql_plan_tables(value)
+
+def _pg_plan_nodes(node):
+    """Nodes of a PostgreSQL EXPLAIN (FORMAT JSON) plan tree"""
+    yield node
+    for child in node.get('Plans', []):
+        yield from _pg_plan_nodes(child)
+
+class PlanCollector:
+    """
+    Captures the plans of queries that are slower on OpenHalo, on connections of its own:
+      - MySQL: EXPLAIN FORMAT=JSON (estimates only)
+      - OpenHalo: EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) of the PostgreSQL version of the query over
+        the native PostgreSQL port (see to_postgres_dialect). ANALYZE executes the statement, so it
+        is only used for read-only queries; the plan of the OpenHalo translation may differ slightly.
+    and summarizes the differences: full scans vs index use, join algorithms, misestimated row counts.
+    """
+
+    PG_READ_ONLY = ('SELECT', 'WITH', '(')
+    MISESTIMATE_FACTOR = 10 # Estimated vs actual rows
+
+    def __init__(self, mysql_config, pg_config=None, ratio=1.5):
+        self.mysql_config = mysql_config
+        self.pg_config = pg_config
+        self.ratio = ratio # Plans are captured when OpenHalo mean > ratio * MySQL mean
+        self.conns = {}
+        self.lock = threading.Lock() # One connection per engine, shared by parallel tests
+
+    def _cursor(self, dialect):
+        if dialect not in self.conns:
+            config = self.pg_config if dialect == 'postgres' else self.mysql_config
+            conn = connect_target(config, dialect)
+            conn.autocommit = True
+            self.conns[dialect] = conn
+        return self.conns[dialect].cursor()
+
+    def _explain(self, dialect, sql):
+        cursor = self._cursor(dialect)
+        try:
+            cursor.execute(sql)
+            plan = cursor.fetchone()[0]
+            cursor.fetchall()
+        finally:
+            cursor.close()
+        # mysql-connector returns the document as text, psycopg2 decodes json columns
+        return json.loads(plan) if isinstance(plan, (str, bytes, bytearray)) else plan
+
+    def capture(self, query, pg_query=None):
+        """EXPLAIN output of both engines plus their differences, errors included"""
+        with self.lock:
+            return self._capture(query, pg_query)
+
+    def _capture(self, query, pg_query):
+        plans = {}
+        try:
+            plans['mysql'] = self._explain('mysql', "EXPLAIN FORMAT=JSON " + query.strip().rstrip(';'))
+        except Exception as e:
+            plans['mysql_error'] = str(e).splitlines()[0][:200]
+        if not self.pg_config:
+            plans['openhalo_error'] = "openhalo_pg_config not set"
+        elif pg_query is None:
+            plans['openhalo_error'] = "No PostgreSQL equivalent"
+        else:
+            pg_query = pg_query.strip().rstrip(';')
+            options = "ANALYZE, BUFFERS, FORMAT JSON" if pg_query.upper().startswith(self.PG_READ_ONLY) else "FORMAT JSON"
+            try:
+                plans['openhalo'] = self._explain('postgres', f"EXPLAIN ({options}) {pg_query}")
+            except Exception as e:
+                plans['openhalo_error'] = str(e).splitlines()[0][:200]
+        plans['differences'] = self.diff(plans.get('mysql'), plans.get('openhalo'))
+        return plans
+
+    @staticmethod
+    def summarize_mysql(plan):
+        """Table (alias) -> access method, join algorithms"""
+        tables = list(_mysql_plan_tables(plan))
+        scans = {}
+        for t in tables:
+            access = t['access_type']
+            scans[t['table_name'].lower()] = ("full scan" if access == 'ALL' else
+                                              f"{access} on {t['key']}" if t.get('key') else access)
+        # Tables after the first are joined by index lookups unless MySQL falls back to a join buffer
+        joins = [t.get('using_join_buffer') or 'Nested Loop' for t in tables[1:]]
+        return scans, joins
+
+    @classmethod
+    def summarize_pg(cls, plan):
+        """Table (alias) -> access method, join algorithms, misestimated nodes"""
+        root = plan[0] if isinstance(plan, list) else plan
+        scans, joins, misestimates = {}, [], []
+        for node in _pg_plan_nodes(root['Plan']):
+            node_type = node['Node Type']
+            if 'Relation Name' in node:
+                index = node.get('Index Name') or next(
+                    (child.get('Index Name') for child in node.get('Plans', []) if child.get('Index Name')), None)
+                alias = node.get('Alias', node['Relation Name']).lower()
+                scans[alias] = "full scan" if node_type == 'Seq Scan' else (
+                    f"{node_type} on {index}" if index else node_type)
+            if node_type in ('Nested Loop', 'Hash Join', 'Merge Join'):
+                joins.append(node_type)
+            if 'Actual Rows' in node:
+                estimated, actual = node['Plan Rows'], node['Actual Rows']
+                factor = max(estimated, actual) / max(min(estimated, actual), 1)
+                if factor >= cls.MISESTIMATE_FACTOR:
+                    target = f" on {node['Relation Name']}" if 'Relation Name' in node else ""
+                    misestimates.append((factor, f"{node_type}{target}: estimated {estimated} rows, actual {actual}"))
+        misestimates.sort(reverse=True)
+        return scans, joins, [f"{text} (x{factor:.0f})" for factor, text in misestimates]
+
+    @classmethod
+    def diff(cls, mysql_plan, pg_plan):
+        """Human-readable differences between the two plans"""
+        if not mysql_plan or not pg_plan:
+            return []
+        differences = []
+        my_scans, my_joins = cls.summarize_mysql(mysql_plan)
+        pg_scans, pg_joins, misestimates = cls.summarize_pg(pg_plan)
+
+        for table in sorted(set(my_scans) & set(pg_scans)):
+            my_access, pg_access = my_scans[table], pg_scans[table]
+            if pg_access == "full scan" and my_access != "full scan":
+                differences.append(f"{table}: sequential scan on OpenHalo, MySQL uses {my_access}")
+            elif my_access == "full scan" and pg_access != "full scan":
+                differences.append(f"{table}: full scan on MySQL, OpenHalo uses {pg_access}")
+        if sorted(my_joins) != sorted(pg_joins):
+            differences.append(f"Joins: MySQL {', '.join(my_joins) or 'none'} | OpenHalo {', '.join(pg_joins) or 'none'}")
+        differences.extend(misestimates[:3])
+
+        root = pg_plan[0] if isinstance(pg_plan, list) else pg_plan
+        if 'Execution Time' in root:
+            differences.append(f"OpenHalo backend: execution {root['Execution Time']:.2f} ms, "
+                               f"planning {root.get('Planning Time', 0):.2f} ms")
+        return differences
+
+    def close(self):
+        for conn in self.conns.values():
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+# --- Query Tracing ---
+
+PHASES = ['check', 'execute', 'first_row', 'fetch', 'commit']
+
+def mark_phase(phases, name, start):
+    """Appends the span (name, start, now) to phases when tracing (phases is not None), returns now"""
+    now = time.perf_counter()
+    if phases is not None:
+        phases.append((name, start, now))
+    return now
+
+class QueryTracer:
+    """
+    Writes one JSON line per span, with OpenTelemetry field names: a 'query' span per execution and
+    one child span per client-side phase:
+      check     - connection health check (ping only when needed)
+      execute   - statement sent until the server's answer (result set header / OK packet): parse,
+                  translation and execution on the server
+      first_row - first row received
+      fetch     - remaining rows received (result transfer)
+      commit    - COMMIT of a statement without result set
+    All executions of one test (both targets) share a traceId. Tests may run in parallel (see
+    CatalogScheduler): the current trace is per thread.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'w')
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        # perf_counter -> Unix epoch (ns)
+        self.epoch_offset_ns = time.time_ns() - time.perf_counter_ns()
+
+    def start_trace(self):
+        self.local.trace_id = uuid.uuid4().hex
+
+    def _ns(self, t):
+        return int(t * 1e9) + self.epoch_offset_ns
+
+    def _write(self, span_id, parent_id, name, start, end, attributes):
+        if not hasattr(self.local, 'trace_id'):
+            self.start_trace()
+        span = {"traceId": self.local.trace_id, "spanId": span_id, "parentSpanId": parent_id, "name": name,
+                "startTimeUnixNano": self._ns(start), "endTimeUnixNano": self._ns(end), "attributes": attributes}
+        with self.lock:
+            self.file.write(json.dumps(span) + "\n")
+
+    def record(self, target, query_id, iteration, query, phases, error=None):
+        """Writes the spans of one execution (phases: list of (name, start, end) from mark_phase)"""
+        if not phases:
+            return
+        span_id = uuid.uuid4().hex[:16]
+        attributes = {"db.system": target, "query_id": query_id, "iteration": iteration,
+                      "db.statement": query.strip()[:1000], "status": "ERROR" if error else "OK"}
+        if error:
+            attributes["error"] = str(error).splitlines()[0][:200] if str(error) else type(error).__name__
+        self._write(span_id, None, "query", phases[0][1], phases[-1][2], attributes)
+        for name, start, end in phases:
+            self._write(uuid.uuid4().hex[:16], span_id, name, start, end,
+                        {"db.system": target, "query_id": query_id, "iteration": iteration})
+
+    def close(self):
+        self.file.close()
+        print(f"✓ Query spans saved to {self.path}")
+
+# --- Run History ---
+
+class RunHistoryStore:
+    """
+    Local SQLite store of every run: one row per run (OpenHalo build, MySQL version, dataset scale)
+    and one row per query result, with its raw latencies. compare() tells, query by query, whether
+    a run is significantly slower or faster than a baseline run (Mann-Whitney U on the latencies,
+    Benjamini-Hochberg correction across queries).
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at TEXT NOT NULL,
+            openhalo_build TEXT,
+            mysql_version TEXT,
+            scale TEXT,
+            label TEXT
+        );
+        CREATE TABLE IF NOT EXISTS results (
+            run_id INTEGER NOT NULL REFERENCES runs(run_id),
+            query_id TEXT NOT NULL,
+            target TEXT NOT NULL,
+            query_type TEXT,
+            sql_hash TEXT,
+            status TEXT,
+            rows INTEGER,
+            mean_time REAL,
+            median_time REAL,
+            p95_time REAL,
+            ci_low REAL,
+            ci_high REAL,
+            cold_time REAL,
+            times TEXT -- JSON list of the measured latencies (ms)
+        );
+        CREATE INDEX IF NOT EXISTS idx_results_run ON results (run_id, query_id, target);
+        CREATE INDEX IF NOT EXISTS idx_results_query ON results (query_id, target);
+        CREATE INDEX IF NOT EXISTS idx_runs_build ON runs (openhalo_build, scale);
+    """
+
+    MIN_SAMPLES = 5 # Per side, for the U test
+
+    def __init__(self, path="openhalo_run_history.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(self.SCHEMA)
+
+    @staticmethod
+    def server_version(conn):
+        """SELECT VERSION() on a suite connection, None if unavailable"""
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT VERSION()")
+            version = cursor.fetchone()[0]
+            cursor.close()
+            return str(version)
+        except Exception:
+            return None
+
+    def record_run(self, results: List[QueryResult], openhalo_build=None, mysql_version=None, scale=None, label=None):
+        """Stores the results of a run, returns its run_id"""
+        with self.conn:
+            run_id = self.conn.execute(
+                "INSERT INTO runs (started_at, openhalo_build, mysql_version, scale, label) VALUES (?, ?, ?, ?, ?)",
+                (datetime.datetime.now().isoformat(timespec='seconds'), openhalo_build, mysql_version,
+                 None if scale is None else str(scale), label)).lastrowid
+            self.conn.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, r.query_id, r.target, r.query_type, r.sql_hash, r.status, r.rows, r.mean_time,
+                  r.median_time, r.p95_time, r.ci_low, r.ci_high, r.cold_time, json.dumps(r.times))
+                 for r in results])
+        print(f"✓ Run {run_id} saved to {self.path} ({len(results)} results)")
+        return run_id
+
+    def runs(self):
+        return self.conn.execute("""
+            SELECT r.run_id, r.started_at, r.openhalo_build, r.mysql_version, r.scale, r.label, COUNT(q.query_id)
+            FROM runs r LEFT JOIN results q ON q.run_id = r.run_id
+            GROUP BY r.run_id ORDER BY r.run_id""").fetchall()
+
+    def _samples(self, run_id, target=None):
+        """(query_id, target) -> (sql_hash, latencies) of the successful results of a run"""
+        sql = "SELECT query_id, target, sql_hash, times FROM results WHERE run_id = ? AND status IN ('OK', 'Warning', 'Problem')"
+        params = [run_id]
+        if target:
+            sql += " AND target = ?"
+            params.append(target)
+        samples = {}
+        for query_id, tgt, sql_hash, times in self.conn.execute(sql, params):
+            # A query_id repeated in a run (e.g. DML lifecycle steps) is not comparable
+            samples[(query_id, tgt)] = None if (query_id, tgt) in samples else (sql_hash, json.loads(times))
+        return samples
+
+    def compare(self, baseline_run, run_id=None, target=None, alpha=0.05, min_change=0.05):
+        """
+        Verdict per (query_id, target) of run_id (default: latest run) vs baseline_run:
+        'regression' / 'improvement' when the latency distributions differ (adjusted p < alpha) and the
+        medians by more than min_change, otherwise 'no change'; 'not comparable' when the statement
+        differs, a query_id is repeated, or either side has fewer than MIN_SAMPLES latencies.
+        """
+        if run_id is None:
+            run_id = self.conn.execute("SELECT MAX(run_id) FROM runs").fetchone()[0]
+        baseline, current = self._samples(baseline_run, target), self._samples(run_id, target)
+
+        rows = []
+        for key in sorted(set(baseline) & set(current)):
+            before, after = baseline[key], current[key]
+            row = {"query_id": key[0], "target": key[1], "p_value": None, "verdict": "not comparable"}
+            if before and after:
+                row["baseline_median"], row["median"] = median(before[1]), median(after[1])
+                row["change"] = row["median"] / row["baseline_median"] - 1 if row["baseline_median"] else 0
+                if before[0] == after[0] and min(len(before[1]), len(after[1])) >= self.MIN_SAMPLES:
+                    row["p_value"] = mann_whitney_u(after[1], before[1])[1]
+            rows.append(row)
+
+        tested = [row for row in rows if row["p_value"] is not None]
+        for row, adjusted in zip(tested, benjamini_hochberg([row["p_value"] for row in tested])):
+            row["p_adjusted"] = adjusted
+            if adjusted < alpha and row["change"] > min_change:
+                row["verdict"] = "regression"
+            elif adjusted < alpha and row["change"] < -min_change:
+                row["verdict"] = "improvement"
+            else:
+                row["verdict"] = "no change"
+        return run_id, rows
+
+    def close(self):
+        self.conn.close()
+
+def print_run_comparison(store, baseline_run, run_id=None, target=None, alpha=0.05, min_change=0.05):
+    """Prints the comparison of two runs, returns the number of regressions"""
+    run_id, rows = store.compare(baseline_run, run_id, target, alpha, min_change)
+    info = {run[0]: run for run in store.runs()}
+    for rid, name in ((baseline_run, "Baseline"), (run_id, "Run")):
+        run = info.get(rid)
+        if run:
+            print(f"  {name:<8}: run {rid} of {run[1]} | OpenHalo {run[2] or '?'} | MySQL {run[3] or '?'} | "
+                  f"scale {run[4] or '?'}{f' | {run[5]}' if run[5] else ''}")
+    if info.get(baseline_run) and info.get(run_id) and info[baseline_run][4] != info[run_id][4]:
+        print("  ⚠ Different dataset scales: latencies are not comparable")
+
+    icons = {"regression": "🔴", "improvement": "🟢", "no change": "⚪", "not comparable": "➖"}
+    print(f"\n  {'ID':<15} {'Target':<10} | {'Baseline (ms)':>13} | {'Run (ms)':>10} | {'Change':>8} | {'p (adj.)':>8} | Verdict")
+    print("-" * 90)
+    for row in sorted(rows, key=lambda r: (r["verdict"] not in ("regression", "improvement"), r["query_id"])):
+        if row["verdict"] == "not comparable" and "median" not in row:
+            continue
+        p_str = f"{row['p_adjusted']:.4f}" if row.get("p_adjusted") is not None else "-"
+        print(f"  {row['query_id']:<15} {row['target']:<10} | {row['baseline_median']:>13.2f} | {row['median']:>10.2f} | "
+              f"{row['change']:>+8.1%} | {p_str:>8} | {icons[row['verdict']]} {row['verdict']}")
+
+    counts = collections.Counter(row["verdict"] for row in rows)
+    print(f"\n  {counts['regression']} regressions, {counts['improvement']} improvements, {counts['no change']} unchanged, "
+          f"{counts['not comparable']} not comparable (alpha={alpha}, min change={min_change:.0%})")
+    return counts['regression']
+
+def history_command(argv):
+    """Command line: runs | compare BASELINE [RUN]"""
+    parser = argparse.ArgumentParser(prog="openhalo_test_suite.py", description="Run history of the test suite")
+    parser.add_argument("--db", default="openhalo_run_history.db", help="SQLite run history file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("runs", help="List the stored runs")
+    compare = commands.add_parser("compare", help="Significant latency changes of a run vs a baseline run")
+    compare.add_argument("baseline", type=int, help="Baseline run_id")
+    compare.add_argument("run", type=int, nargs="?", help="Run to check (default: latest)")
+    compare.add_argument("--target", help="Only this target (OpenHalo, MySQL, PostgreSQL)")
+    compare.add_argument("--alpha", type=float, default=0.05, help="Significance level after FDR correction")
+    compare.add_argument("--min-change", type=float, default=0.05, help="Smallest relative change of the median reported")
+    args = parser.parse_args(argv)
+
+    store = RunHistoryStore(args.db)
+    try:
+        if args.command == "runs":
+            print(f"  {'Run':>4} | {'Started':<19} | {'OpenHalo build':<30} | {'Scale':<10} | Results | Label")
+            for run_id, started, build, _, scale, label, count in store.runs():
+                print(f"  {run_id:>4} | {started:<19} | {(build or '?')[:30]:<30} | {scale or '?':<10} | {count:>7} | {label or ''}")
+            return 0
+        print(f"\n📈 RUN COMPARISON (Mann-Whitney U)")
+        return 1 if print_run_comparison(store, args.baseline, args.run, args.target, args.alpha, args.min_change) else 0
+    finally:
+        store.close()
+
 # --- Dual Query Tester ---
 
 class DualQueryTester:
-    def __init__(self, db_connector: DualDatabaseConnector, iterations: int = 5, warmup: int = 1):
+    def __init__(self, db_connector: DualDatabaseConnector, iterations: int = 5, warmup: int = 1,
+                 stream_results: bool = False, fetch_batch_size: int = 1000, prepared: bool = False,
+                 trace_file: str = None, server_stats: Dict = None, plan_collector: 'PlanCollector' = None,
+                 ci_target: float = None, ci_budget_seconds: float = 5.0, max_iterations: int = 500,
+                 ci_confidence: float = 0.95, warmup_cv: float = 0.10, warmup_window: int = 5,
+                 max_warmup_runs: int = 1, warmup_budget_seconds: float = 5.0):
         self.db = db_connector
         self.iterations = iterations
+        # Warm-up of SELECTs (0 = none): the exact statement runs `warmup` times. With max_warmup_runs above
+        # `warmup`, it is repeated until the coefficient of variation of the last warmup_window runs is below
+        # warmup_cv
         self.warmup = warmup
+        self.warmup_cv = warmup_cv
+        self.warmup_window = warmup_window
+        self.max_warmup_runs = max_warmup_runs
+        self.warmup_budget_seconds = warmup_budget_seconds
+        # Adaptive sampling: SELECTs are repeated (at least `iterations` times) until the confidence
+        # interval of the median is narrower than ci_target x median, or ci_budget_seconds / max_iterations
+        # run out (None = fixed iteration count)
+        self.ci_target = ci_target
+        self.ci_budget_seconds = ci_budget_seconds
+        self.max_iterations = max_iterations
+        self.ci_confidence = ci_confidence
+        # Streaming mode: rows are consumed in fetchmany batches and counted, never kept in memory
+        self.stream_results = stream_results
+        self.fetch_batch_size = fetch_batch_size
+        # Prepared mode: literals become parameters, executions go through the binary protocol
+        self.prepared = prepared
+        # Per-phase spans of every timed execution, as JSON lines (None = no tracing)
+        self.tracer = QueryTracer(trace_file) if trace_file else None
+        # Target name -> ServerStatsCollector, snapshots taken around each test (None = not collected)
+        self.server_stats = server_stats or {}
+        # EXPLAIN capture for queries slower on OpenHalo (None = disabled)
+        self.plan_collector = plan_collector
         self.results: List[QueryResult] = []
+        self.benchmarks: Dict = {} # Stress test results (incl. time series), saved with the report
 
-    def execute_query(self, query: str, conn) -> Tuple[List, float]:
-        """Execute a query on a given connection and return results + execution time"""
-
+    def execute_query(self, query: str, conn, phases=None) -> Tuple[List, float]:
+        """
+        Execute a query on a given connection and return results + execution time.
+        phases: list receiving (phase, start, end) perf_counter spans when tracing (see QueryTracer)
+        """
+        check_start = time.perf_counter()
         try:
-            # Check if the connection is active, otherwise reconnect (3 attempts)
+            # Lazy health check: only pings after an error or a long idle period, not before each query
             if conn:
-                conn.ping(reconnect=True, attempts=3, delay=1)
+                self.db.check(conn)
         except Exception:
             # If the ping fails, let the cursor try its luck (and fail properly)
             pass
+        mark_phase(phases, 'check', check_start)
 
         cursor = conn.cursor()
         try:
             start = time.perf_counter()
             # Handle multiple statements if necessary, though simpler is better for timing
             cursor.execute(query)
+            # Returns once the server has answered (result set header or OK packet)
+            executed = mark_phase(phases, 'execute', start)
             
             query_clean = query.strip().upper().lstrip('(').strip()
             
             if any(query_clean.startswith(x) for x in ['SELECT', 'WITH', 'SHOW', 'DESCRIBE', 'CALL', 'CHECK']):
                 try:
                     results = cursor.fetchall()
-                except mysql.connector.Error as e:
+                except DB_ERRORS as e:
                     if "No result set" in str(e):
                         results = []
                     else:
                         raise e
+                mark_phase(phases, 'fetch', executed)
             else:
                 results = []
                 conn.commit()
+                mark_phase(phases, 'commit', executed)
             
             end = time.perf_counter()
             return results, (end - start) * 1000  # ms
             
-        except mysql.connector.Error as e:
+        except DB_ERRORS as e:
             # Do not always rollback here to allow testing transactional errors
             # but rollback on fatal errors to clean the connection
+            self.db.flag(conn)
             conn.rollback()
             raise e
         finally:
             cursor.close()
 
+    def _consume_rows(self, cursor, on_rows, phases, executed):
+        """Reads a result set: first row, then fetchmany batches. Returns (row count, first row time)"""
+        rows_count = 0
+        row = cursor.fetchone()
+        first_row = mark_phase(phases, 'first_row', executed)
+        batch = [row] if row is not None else []
+        while batch:
+            rows_count += len(batch)
+            if on_rows:
+                on_rows(batch)
+            batch = cursor.fetchmany(self.fetch_batch_size)
+        mark_phase(phases, 'fetch', first_row)
+        return rows_count, first_row
+
+    def execute_query_streaming(self, query: str, conn, on_rows=None, phases=None) -> Tuple[int, float, float]:
+        """
+        Execute a query and consume the result set without keeping it.
+        on_rows(batch) is called for each batch of rows (e.g. to compute a digest).
+        Returns the row count, the time to last row (incl. commit) and the time to first row (ms, 0 without result set).
+        """
+        check_start = time.perf_counter()
+        try:
+            if conn:
+                self.db.check(conn)
+        except Exception:
+            pass
+        mark_phase(phases, 'check', check_start)
+
+        pg_autocommit = None
+        if is_postgres_conn(conn):
+            # The default psycopg2 cursor buffers the whole result set in execute(): a named (server-side)
+            # cursor fetches it in batches instead. It needs a transaction, so autocommit is suspended
+            pg_autocommit, conn.autocommit = conn.autocommit, False
+            cursor = conn.cursor(name=f"stream_{uuid.uuid4().hex[:12]}")
+        else:
+            cursor = conn.cursor() # Unbuffered: rows are read from the socket as they are fetched
+        try:
+            start = time.perf_counter()
+            cursor.execute(query)
+            executed = mark_phase(phases, 'execute', start)
+            rows_count = 0
+            first_row = None
+
+            query_clean = query.strip().upper().lstrip('(').strip()
+
+            if any(query_clean.startswith(x) for x in ['SELECT', 'WITH', 'SHOW', 'DESCRIBE', 'CALL', 'CHECK']):
+                try:
+                    rows_count, first_row = self._consume_rows(cursor, on_rows, phases, executed)
+                except DB_ERRORS as e:
+                    if "No result set" not in str(e):
+                        raise e
+            else:
+                conn.commit()
+                mark_phase(phases, 'commit', executed)
+
+            end = time.perf_counter()
+            # No result set (DML/DDL): no time to first row
+            return rows_count, (end - start) * 1000, (first_row - start) * 1000 if first_row else 0
+
+        except DB_ERRORS as e:
+            self.db.flag(conn)
+            conn.rollback()
+            raise e
+        finally:
+            if pg_autocommit is None:
+                cursor.close()
+            else:
+                try:
+                    cursor.close()
+                except DB_ERRORS:
+                    pass # Already gone if the error path rolled back
+                conn.rollback() # Ends the read-only transaction of the named cursor, after the timed part
+                conn.autocommit = pg_autocommit
+
+    def execute_query_prepared(self, query: str, conn, handles: PreparedStatementCache, on_rows=None,
+                               phases=None) -> Tuple[int, float, float]:
+        """
+        Same as execute_query_streaming, on the prepared handle of the statement (binary protocol).
+        The prepare round trip of a new statement shape is timed apart (handles.prepare_hist),
+        before the timer starts.
+        """
+        try:
+            cursor, sql, params, pending = handles.get(query)
+            if pending and statement_kind(sql) == 'read':
+                # No parameters: the cursor only prepares by executing, done once outside the timer
+                cursor.execute(sql, params)
+                if cursor.with_rows:
+                    cursor.fetchall()
+            start = time.perf_counter()
+            cursor.execute(sql, params)
+            executed = mark_phase(phases, 'execute', start)
+            rows_count = 0
+            first_row = None
+            if cursor.with_rows:
+                rows_count, first_row = self._consume_rows(cursor, on_rows, phases, executed)
+            else:
+                conn.commit()
+                mark_phase(phases, 'commit', executed)
+
+            end = time.perf_counter()
+            return rows_count, max(end - start, 0) * 1000, max(first_row - start, 0) * 1000 if first_row else 0
+
+        except mysql.connector.Error as e:
+            self.db.flag(conn)
+            conn.rollback()
+            raise e
+
+    def warm_up(self, query: str, conn, handles=None):
+        """
+        Runs the exact statement, through the measured path, `warmup` times. When max_warmup_runs is
+        above `warmup`, keeps running it until its latency is stable: coefficient of variation of the
+        last warmup_window runs (the first one excluded) <= warmup_cv, or max_warmup_runs /
+        warmup_budget_seconds is reached.
+        Returns (cold latency of the first run in ms, runs, converged), converged being None when the
+        stability is not checked; (None, runs, False) on error, which is left to the measured runs to report.
+        """
+        latencies = []
+        check_stability = self.max_warmup_runs > self.warmup
+        deadline = time.perf_counter() + self.warmup_budget_seconds
+        while True:
+            try:
+                if handles:
+                    # Handles are prepared before the timer, the first run measures execution only
+                    _, elapsed, _ = self.execute_query_prepared(query, conn, handles)
+                elif self.stream_results:
+                    _, elapsed, _ = self.execute_query_streaming(query, conn)
+                else:
+                    _, elapsed = self.execute_query(query, conn)
+            except Exception:
+                return None, len(latencies) + 1, False
+            latencies.append(elapsed)
+            if not check_stability:
+                if len(latencies) >= self.warmup:
+                    return latencies[0], len(latencies), None
+                continue
+
+            window = latencies[1:][-self.warmup_window:]
+            if len(latencies) >= self.warmup and len(window) == self.warmup_window:
+                window_mean = mean(window)
+                if window_mean == 0 or pstdev(window) / window_mean <= self.warmup_cv:
+                    return latencies[0], len(latencies), True
+            if len(latencies) >= self.max_warmup_runs or time.perf_counter() >= deadline:
+                return latencies[0], len(latencies), False
+
+    def _ci_converged(self, times) -> bool:
+        ci = median_ci(times, self.ci_confidence)
+        return ci is not None and ci[1] - ci[0] <= self.ci_target * median(times)
+
     def classify_performance(self, mean_time: float) -> str:
         if mean_time <= 50: return "OK"
         elif mean_time <= 200: return "Warning"
@@ -344,7 +2343,12 @@ class DualQueryTester:
 
     def test_single_target(self, target: str, conn, query_id: str, query_type: str, query: str, skip: bool):
         times = []
+        first_row_times = []
         rows_count = 0
+        fingerprint = None
+        handles = None
+        protocol = "text"
+        phase_times = {}
 
         if skip:
             return QueryResult(
@@ -361,32 +2365,98 @@ class DualQueryTester:
             )
 
         try:
+            if self.prepared and not is_postgres_conn(conn):
+                try:
+                    self.db.check(conn) # Not per execution
+                except Exception:
+                    pass
+                handles = PreparedStatementCache(conn)
+                try:
+                    handles.prepare(query)
+                    protocol = "prepared"
+                except mysql.connector.Error as e:
+                    if e.errno != ER_UNSUPPORTED_PS:
+                        raise
+                    print(f"  [{target}] Not supported by the prepared statement protocol, sent as text")
+                    handles.close()
+                    handles = None
+
             # Warmup (only for SELECTs to avoid side effects on INSERTs)
             is_select = query.strip().upper().startswith(('SELECT', 'WITH', 'SHOW'))
+            cold_time, warmup_runs, warmup_converged = None, 0, None
             if is_select and self.warmup > 0:
-                try:
-                    warmup_q = f"{query.rstrip(';')} LIMIT 1;" if 'LIMIT' not in query.upper() and 'SHOW' not in query.upper() else query
-                    self.execute_query(warmup_q, conn)
-                except Exception:
-                    pass 
+                cold_time, warmup_runs, warmup_converged = self.warm_up(query, conn, handles)
 
             # Iterations (1 for non-selects to avoid duplicates errors, self.iterations for SELECTs)
             run_count = self.iterations if is_select else 1
+            adaptive = is_select and self.ci_target is not None
+            deadline = time.perf_counter() + self.ci_budget_seconds
             
-            for _ in range(run_count):
-                results, elapsed = self.execute_query(query, conn)
+            for i in range(max(self.max_iterations, run_count) if adaptive else run_count):
+                phases = [] if self.tracer else None
+                iteration_start = time.perf_counter()
+                try:
+                    if handles:
+                        fp = ResultFingerprint.for_query(query) if i == 0 else None
+                        nb_rows, elapsed, first_row = self.execute_query_prepared(query, conn, handles,
+                                                                                  fp.update if fp else None, phases)
+                        first_row_times.append(first_row)
+                        if fp:
+                            fingerprint = fp.hexdigest()
+                    elif self.stream_results:
+                        # The fingerprint is computed on the first iteration, as the rows stream in
+                        fp = ResultFingerprint.for_query(query) if i == 0 else None
+                        nb_rows, elapsed, first_row = self.execute_query_streaming(query, conn, fp.update if fp else None,
+                                                                                   phases)
+                        first_row_times.append(first_row)
+                        if fp:
+                            fingerprint = fp.hexdigest()
+                    else:
+                        results, elapsed = self.execute_query(query, conn, phases)
+                        nb_rows = len(results) if results else 0
+                        if i == 0:
+                            fp = ResultFingerprint.for_query(query)
+                            fp.update(results or [])
+                            fingerprint = fp.hexdigest()
+                except Exception as e:
+                    if self.tracer:
+                        if not phases: # Failed before the first phase ended
+                            mark_phase(phases, 'execute', iteration_start)
+                        self.tracer.record(target, query_id, i, query, phases, error=e)
+                    raise
+                if self.tracer:
+                    self.tracer.record(target, query_id, i, query, phases)
+                    for name, phase_start, phase_end in phases:
+                        phase_times.setdefault(name, []).append((phase_end - phase_start) * 1000)
                 times.append(elapsed)
                 if rows_count == 0:
-                    rows_count = len(results) if results else 0
+                    rows_count = nb_rows
+                if adaptive and i + 1 >= run_count and (time.perf_counter() >= deadline or self._ci_converged(times)):
+                    break
             
             mean_time = mean(times)
             median_time = median(times)
+            ci = median_ci(times, self.ci_confidence)
+            ci_str = f", median CI [{ci[0]:.2f}, {ci[1]:.2f}]ms over {len(times)} runs" if ci else ""
+            if cold_time is not None:
+                ci_str += (f" | cold: {cold_time:.2f}ms, {warmup_runs} warm-up runs"
+                           f"{' (not stable)' if warmup_converged is False else ''}")
 
-            p95_val = 0
+            hist = LatencyHistogram()
+            for t in times:
+                hist.record(t)
 
             status = self.classify_performance(mean_time)
+            prepare_time = handles.prepare_hist.mean() if handles else 0
+            if handles:
+                handles.close()
             
-            print(f"  [{target}] Mean: {mean_time:.2f}ms, Rows: {rows_count}, Status: {status}")
+            if handles:
+                print(f"  [{target}] Prepare: {prepare_time:.2f}ms, Execute mean: {mean_time:.2f}ms{ci_str}, Rows: {rows_count}, Status: {status}")
+            elif any(first_row_times):
+                print(f"  [{target}] Mean: {mean_time:.2f}ms (first row: {median(first_row_times):.2f}ms){ci_str}, Rows: {rows_count}, Status: {status}")
+            else:
+                print(f"  [{target}] Mean: {mean_time:.2f}ms{ci_str}, Rows: {rows_count}, Status: {status}")
             return QueryResult(
                 target=target,
                 query_id=query_id,
@@ -394,13 +2464,28 @@ class DualQueryTester:
                 times=times,
                 mean_time=mean_time,
                 median_time=median_time,
-                p95_time=p95_val,
+                p95_time=hist.percentile(95),
                 status=status,
                 rows=rows_count,
-                error=None
+                error=None,
+                p99_time=hist.percentile(99),
+                max_time=hist.max,
+                first_row_time=median(first_row_times) if any(first_row_times) else 0,
+                fingerprint=fingerprint,
+                protocol=protocol,
+                prepare_time=prepare_time,
+                phases={name: median(values) for name, values in phase_times.items()} if phase_times else None,
+                ci_low=ci[0] if ci else None,
+                ci_high=ci[1] if ci else None,
+                sql_hash=hashlib.sha1(query.encode()).hexdigest()[:16],
+                cold_time=cold_time,
+                warmup_runs=warmup_runs,
+                warmup_converged=warmup_converged
             )
             
         except Exception as e:
+            if handles:
+                handles.close()
             error_msg = str(e)
             status = "Error"
             
@@ -421,21 +2506,61 @@ class DualQueryTester:
                 p95_time=0,
                 status=status,
                 rows=0,
-                error=error_msg
+                error=error_msg,
+                protocol="prepared" if self.prepared else "text"
             )
 
-    def test_query(self, query_id: str, query_type: str, query: str, skip: bool = False):
+    def test_query(self, query_id: str, query_type: str, query: str, skip: bool = False, pg_query: str = None,
+                   sessions: Dict = None):
+        """
+        Runs query on OpenHalo and MySQL, and its PostgreSQL version on the native PostgreSQL target
+        if connected (pg_query, or the mechanical translation of query; read-only queries only).
+        sessions: connections by target name, for parallel workers (default: the suite sessions)
+        """
+        sessions = sessions or self.db.sessions()
         print(f"\nTesting: {query_id} ({query_type})")
+        if self.tracer:
+            self.tracer.start_trace()
         
         # Test OpenHalo
-        oh_res = self.test_single_target('OpenHalo', self.db.openhalo_conn, query_id, query_type, query, skip)
+        oh_res = self._test_with_server_stats('OpenHalo', sessions['OpenHalo'], query_id, query_type, query, skip)
         self.results.append(oh_res)
 
+        pg_query = pg_query or to_postgres_dialect(query)
+
         # Test MySQL
-        if self.db.mysql_conn:
-            mysql_res = self.test_single_target('MySQL', self.db.mysql_conn, query_id, query_type, query, False)
+        if sessions.get('MySQL'):
+            mysql_res = self._test_with_server_stats('MySQL', sessions['MySQL'], query_id, query_type, query, False)
             self.results.append(mysql_res)
 
+            collector = self.plan_collector
+            if collector and mysql_res.mean_time > 0 and oh_res.mean_time > collector.ratio * mysql_res.mean_time:
+                oh_res.plans = collector.capture(query, pg_query)
+                for line in oh_res.plans['differences']:
+                    print(f"  [Plan] {line}")
+
+        # Native PostgreSQL baseline on the same backend: OpenHalo - PostgreSQL = compatibility layer overhead
+        if sessions.get(PG_TARGET):
+            if pg_query is None:
+                self.results.append(QueryResult(target=PG_TARGET, query_id=query_id, query_type=query_type, times=[],
+                                                mean_time=0, median_time=0, p95_time=0, status="Skipped", rows=0,
+                                                error="No read-only PostgreSQL equivalent"))
+            else:
+                self.results.append(self.test_single_target(PG_TARGET, sessions[PG_TARGET], query_id, query_type,
+                                                            pg_query, skip))
+
+    def _test_with_server_stats(self, target, conn, query_id, query_type, query, skip):
+        """test_single_target between two server statistics snapshots, when collected for this target"""
+        collector = self.server_stats.get(target)
+        before = collector.snapshot() if collector and not skip else None
+        result = self.test_single_target(target, conn, query_id, query_type, query, skip)
+        if before:
+            collector.attach(result, before)
+            if result.server_time is not None and result.times:
+                print(f"  [{target}] Server: {result.server_time:.2f}ms per statement ({result.server_calls} statements), "
+                      f"rows: {result.server_rows}, buffer hits/reads: {result.buffer_hits}/{result.buffer_reads}")
+        return result
+
     def generate_report(self, output_file: str = "openhalo_full_compatibility_report.json"):
         print("\n" + "="*60)
         print("FULL COMPATIBILITY REPORT GENERATION")
@@ -445,10 +2570,14 @@ class DualQueryTester:
             "meta": {"timestamp": time.time()},
             "queries": [asdict(r) for r in self.results]
         }
+        if self.benchmarks:
+            output_data["benchmarks"] = self.benchmarks
 
         with open(output_file, 'w') as f:
             json.dump(output_data, f, indent=2)
         print(f"\n✓ Report saved to {output_file}")
+        if self.tracer:
+            self.tracer.close()
     
     def generate_summary(self):
         print("\n" + "=" * 60)
@@ -492,6 +2621,9 @@ class DualQueryTester:
                 ratio = oh_time / my_time
                 if ratio > 1.5:
                     diff_str = f"x{ratio:.1f} slower 🔴"
+                    # The medians' confidence intervals overlap: not enough samples to support the verdict
+                    if r.ci_low is not None and my_r.ci_high is not None and r.ci_low <= my_r.ci_high:
+                        diff_str += " (CIs overlap)"
                 elif ratio < 0.7:
                     diff_str = f"x{1/ratio:.1f} faster 🟢"
                 else:
@@ -540,6 +2672,105 @@ class DualQueryTester:
                     f"MySQL={my_r.mean_time:>7.2f} ms → Δ {delta:.2f} ms"
                 )
 
+        # ---- Result consistency ----
+        print("\n🔍 Result consistency (row fingerprints OpenHalo vs MySQL)")
+        matched, not_comparable, mismatches = 0, 0, []
+        for qid, oh_r in oh_map.items():
+            my_r = mysql_map.get(qid)
+            if not my_r or not oh_r.fingerprint or not my_r.fingerprint:
+                continue
+            if oh_r.fingerprint.startswith('any:') or my_r.fingerprint.startswith('any:'):
+                not_comparable += 1 # LIMIT without ORDER BY: both engines may return different rows
+            elif oh_r.fingerprint == my_r.fingerprint:
+                matched += 1
+            else:
+                mismatches.append((qid, oh_r, my_r))
+        print(f"  ✅ Identical results      : {matched}")
+        print(f"  ⚪ Not comparable (LIMIT without ORDER BY): {not_comparable}")
+        print(f"  🔴 Different results      : {len(mismatches)}")
+        for qid, oh_r, my_r in mismatches:
+            print(f"  {qid:<15} OH rows={oh_r.rows:<7} MySQL rows={my_r.rows:<7} "
+                  f"({oh_r.fingerprint} vs {my_r.fingerprint})")
+
+        # ---- Client-side phases (tracing) ----
+        # Only queries traced on both engines, so that the totals compare the same work
+        both = [(oh_r, mysql_map[qid]) for qid, oh_r in oh_map.items()
+                if oh_r.phases and qid in mysql_map and mysql_map[qid].phases]
+        if both:
+            print(f"\n⏱ Client-side phases ({len(both)} queries, sum of per-query medians)")
+            print(f"  {'Phase':<10} | {'OpenHalo (ms)':>13} | {'MySQL (ms)':>11} | {'Δ (ms)':>9}")
+            for phase in PHASES:
+                oh_total = sum(o.phases.get(phase, 0) for o, _ in both)
+                my_total = sum(m.phases.get(phase, 0) for _, m in both)
+                if oh_total or my_total:
+                    print(f"  {phase:<10} | {oh_total:>13.2f} | {my_total:>11.2f} | {oh_total - my_total:>+9.2f}")
+
+        # ---- Three-way: MySQL / OpenHalo / native PostgreSQL ----
+        pg_map = {r.query_id: r for r in self.results if r.target == PG_TARGET}
+        three_way = [(qid, oh_r, mysql_map[qid], pg_map[qid]) for qid, oh_r in oh_map.items()
+                     if qid in mysql_map and qid in pg_map
+                     and all(r.status in ("OK", "Warning", "Problem") for r in (oh_r, mysql_map[qid], pg_map[qid]))]
+        if pg_map:
+            print(f"\n🐘 Three-way comparison ({len(three_way)} queries OK on all targets, "
+                  f"{sum(r.status == 'Skipped' for r in pg_map.values())} without PostgreSQL equivalent)")
+            if three_way:
+                my_total = sum(m.mean_time for _, _, m, _ in three_way)
+                oh_total = sum(o.mean_time for _, o, _, _ in three_way)
+                pg_total = sum(p.mean_time for _, _, _, p in three_way)
+                print(f"  MySQL                 : {my_total:>10.2f} ms")
+                print(f"  OpenHalo (MySQL wire) : {oh_total:>10.2f} ms")
+                print(f"  PostgreSQL (native)   : {pg_total:>10.2f} ms")
+                if pg_total > 0:
+                    print(f"  ➜ Compatibility layer overhead (OpenHalo - PostgreSQL): {oh_total - pg_total:+.2f} ms "
+                          f"({(oh_total - pg_total) / pg_total:+.1%})")
+                print("  Largest overheads:")
+                for qid, o, _, p in sorted(three_way, key=lambda t: t[1].mean_time - t[3].mean_time, reverse=True)[:10]:
+                    print(f"  {qid:<15} OH={o.mean_time:>7.2f} ms | PG={p.mean_time:>7.2f} ms → Δ {o.mean_time - p.mean_time:+.2f} ms")
+
+        # ---- First execution vs steady state ----
+        warmed = [(qid, oh_r, mysql_map[qid]) for qid, oh_r in oh_map.items()
+                  if oh_r.cold_time is not None and qid in mysql_map and mysql_map[qid].cold_time is not None]
+        if warmed:
+            print(f"\n🧊 First execution (cold) vs steady state ({len(warmed)} queries)")
+            for name, pick in (("OpenHalo", lambda t: t[1]), ("MySQL", lambda t: t[2])):
+                cold_total = sum(pick(t).cold_time for t in warmed)
+                steady_total = sum(pick(t).median_time for t in warmed)
+                unstable = sum(pick(t).warmup_converged is False for t in warmed)
+                print(f"  {name:<9}: cold {cold_total:>9.2f} ms | steady median {steady_total:>9.2f} ms | "
+                      f"first-execution overhead {cold_total - steady_total:+.2f} ms ({unstable} not stable)")
+            print("  Largest first-execution overheads on OpenHalo:")
+            for qid, o, m in sorted(warmed, key=lambda t: t[1].cold_time - t[1].median_time, reverse=True)[:10]:
+                print(f"  {qid:<15} OH cold={o.cold_time:>7.2f} / steady={o.median_time:>7.2f} ms | "
+                      f"MySQL cold={m.cold_time:>7.2f} / steady={m.median_time:>7.2f} ms")
+
+        # ---- Plan differences of slow queries ----
+        explained = [r for r in oh if r.plans]
+        if explained:
+            print(f"\n🔬 Plan differences for queries > {self.plan_collector.ratio}x slower on OpenHalo "
+                  f"({len(explained)} queries, plans saved in the JSON report)")
+            for r in explained:
+                print(f"  {r.query_id}:")
+                errors = [f"{k.split('_')[0]}: {v}" for k, v in r.plans.items() if k.endswith('_error')]
+                for line in r.plans['differences'] + errors:
+                    print(f"    - {line}")
+                if not r.plans['differences'] and not errors:
+                    print("    - Same access paths and join algorithms")
+
+        # ---- Server vs client time ----
+        both = [(oh_r, mysql_map[qid]) for qid, oh_r in oh_map.items()
+                if oh_r.server_time is not None and oh_r.times and qid in mysql_map
+                and mysql_map[qid].server_time is not None and mysql_map[qid].times]
+        if both:
+            print(f"\n🖥 Server vs client time ({len(both)} queries, sum of means, ms)")
+            print(f"  {'Engine':<9} | {'Client':>9} | {'Server':>9} | {'Client-only':>11} | {'Server rows':>11} | {'Buf. hits':>10}")
+            for name, idx in (('OpenHalo', 0), ('MySQL', 1)):
+                client = sum(pair[idx].mean_time for pair in both)
+                server = sum(pair[idx].server_time for pair in both)
+                rows = sum(pair[idx].server_rows for pair in both)
+                hits = sum(pair[idx].buffer_hits for pair in both)
+                # Client-only: network, driver and, for OpenHalo, protocol translation and planning
+                print(f"  {name:<9} | {client:>9.2f} | {server:>9.2f} | {client - server:>11.2f} | {rows:>11} | {hits:>10}")
+
         # ---- Missing / unsupported features ----
         print("\n🚫 Unsupported / failing features on OpenHalo")
         for r in oh:
@@ -583,57 +2814,776 @@ class DualQueryTester:
             print(f"  {cat_name:<25} | {oh_val:>12} | {my_val:>12}")
 
 
+# --- Schema Sandboxes ---
+
+class SandboxManager:
+    """
+    Sandbox databases (schemas on OpenHalo) for tests that change shared objects: indexes,
+    constraints, scratch tables. A sandbox gets server-side copies (CREATE TABLE ... LIKE +
+    INSERT ... SELECT) of the tables a test needs, taken from a template database cloned once from
+    the source database at the start of the run: every sandboxed test starts from the same data,
+    whatever ran before it. Sandboxes are reused by the following tests (their tables are dropped
+    and copied again) and dropped all together by teardown(), with the leftovers of aborted runs.
+    """
+
+    def __init__(self, configs: Dict, suffix='_sbx'):
+        self.configs = configs # Target name -> config of the source database (MySQL protocol)
+        self.suffix = suffix
+        self.idle = []
+        self.created = 0
+        self.templates = set()
+        self.lock = threading.Lock()
+        self.template_lock = threading.Lock()
+
+    def _name(self, target, tag):
+        return f"{self.configs[target]['database']}{self.suffix}_{tag}"
+
+    @staticmethod
+    def _run(conn, statements):
+        cursor = conn.cursor()
+        try:
+            for sql in statements:
+                cursor.execute(sql)
+                if cursor.with_rows:
+                    cursor.fetchall()
+            conn.commit()
+        finally:
+            cursor.close()
+
+    def _copy(self, conn, dst, src, table):
+        try:
+            self._run(conn, [f"CREATE TABLE {dst}.{table} LIKE {src}.{table}",
+                             f"INSERT INTO {dst}.{table} SELECT * FROM {src}.{table}"])
+        except mysql.connector.Error:
+            # No CREATE TABLE ... LIKE: columns and data only, without keys and indexes
+            self._run(conn, [f"DROP TABLE IF EXISTS {dst}.{table}",
+                             f"CREATE TABLE {dst}.{table} AS SELECT * FROM {src}.{table}"])
+
+    def prepare(self, tables):
+        """Clones tables into the template database of each target (once per run)"""
+        with self.template_lock:
+            self._prepare(sorted(set(tables) - self.templates))
+
+    def _prepare(self, missing):
+        for target, config in self.configs.items() if missing else []:
+            template = self._name(target, 'tpl')
+            conn = connect_target(config)
+            try:
+                self._run(conn, [f"CREATE DATABASE IF NOT EXISTS {template}"])
+                for table in missing:
+                    self._run(conn, [f"DROP TABLE IF EXISTS {template}.{table}"])
+                    self._copy(conn, template, config['database'], table)
+            finally:
+                conn.close()
+            print(f"  [{target}] Sandbox template {template}: {', '.join(missing)}")
+        self.templates.update(missing)
+
+    def acquire(self, tables) -> Dict:
+        """A sandbox holding fresh copies of tables: {'names': {target: database}, 'sessions': {target: conn}}"""
+        with self.lock:
+            sandbox = self.idle.pop() if self.idle else None
+            if sandbox is None:
+                self.created += 1
+                number = self.created
+        if sandbox is None:
+            sandbox = {'names': {}, 'sessions': {}}
+            try:
+                for target, config in self.configs.items():
+                    name = self._name(target, number)
+                    conn = connect_target(config)
+                    try:
+                        self._run(conn, [f"DROP DATABASE IF EXISTS {name}", f"CREATE DATABASE {name}"])
+                    finally:
+                        conn.close()
+                    sandbox['names'][target] = name
+                    # The tests use unqualified names: the sandbox is the default database of its sessions
+                    sandbox['sessions'][target] = connect_target(dict(config, database=name))
+                    sandbox['sessions'][target].autocommit = False
+            except Exception:
+                self._close(sandbox)
+                raise
+        try:
+            self.reset(sandbox, tables)
+        except Exception:
+            self._close(sandbox)
+            raise
+        return sandbox
+
+    def reset(self, sandbox, tables):
+        """Drops the tables left by the previous test and copies tables from the templates"""
+        self.prepare(tables)
+        for target, conn in sandbox['sessions'].items():
+            name = sandbox['names'][target]
+            cursor = conn.cursor()
+            cursor.execute("SHOW TABLES")
+            leftovers = [row[0] for row in cursor.fetchall()]
+            cursor.close()
+            if leftovers:
+                try:
+                    # MySQL checks foreign keys table by table; one statement is enough for PostgreSQL
+                    self._run(conn, ["SET FOREIGN_KEY_CHECKS = 0"])
+                    fk_checks_off = True
+                except mysql.connector.Error:
+                    fk_checks_off = False
+                self._run(conn, [f"DROP TABLE IF EXISTS {', '.join(leftovers)}"])
+                if fk_checks_off:
+                    self._run(conn, ["SET FOREIGN_KEY_CHECKS = 1"])
+            for table in sorted(tables):
+                self._copy(conn, name, self._name(target, 'tpl'), table)
+
+    def release(self, sandbox):
+        for conn in sandbox['sessions'].values():
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+        with self.lock:
+            self.idle.append(sandbox)
+
+    @staticmethod
+    def _close(sandbox):
+        for conn in sandbox['sessions'].values():
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def teardown(self):
+        """Drops every sandbox and template database of the source databases, including earlier runs"""
+        with self.lock:
+            sandboxes, self.idle = self.idle, []
+            self.templates = set()
+        for sandbox in sandboxes:
+            self._close(sandbox)
+        for target, config in self.configs.items():
+            prefix = f"{config['database']}{self.suffix}_"
+            try:
+                conn = connect_target(config)
+                cursor = conn.cursor()
+                cursor.execute("SHOW DATABASES")
+                names = [row[0] for row in cursor.fetchall() if row[0].startswith(prefix)]
+                cursor.close()
+                self._run(conn, [f"DROP DATABASE IF EXISTS {name}" for name in names])
+                conn.close()
+                if names:
+                    print(f"  [{target}] Dropped {len(names)} sandbox databases")
+            except Exception as e:
+                print(f"  ⚠ [{target}] Sandbox teardown failed: {e}")
+
+# --- Test Catalog ---
+
+CATALOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_catalog.json')
+
+def statement_kind(sql):
+    """'read', 'dml', 'ddl' or 'session' (connection state: USE, transactions, handlers, diagnostics)"""
+    words = sql.strip().lstrip('(').split(None, 1)
+    first = words[0].upper() if words else ''
+    if first in ('SELECT', 'WITH', 'SHOW', 'DESCRIBE', 'DESC', 'EXPLAIN'):
+        return 'read'
+    if first in ('INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'CALL', 'LOAD'):
+        return 'dml'
+    if first in ('USE', 'SET', 'START', 'BEGIN', 'COMMIT', 'ROLLBACK', 'HANDLER', 'GET', 'LOCK', 'UNLOCK'):
+        return 'session'
+    return 'ddl'
+
+@dataclass
+class CatalogEntry:
+    query_id: str
+    category: str
+    sql: str
+    kind: str = 'read' # 'read' can run in parallel; 'dml', 'ddl', 'session' run alone on the suite sessions
+    chain: str = None # Entries of a chain run in catalog order, on the same sessions
+    depends_on: List[str] = field(default_factory=list)
+    setup: List[str] = field(default_factory=list) # Untimed, on OpenHalo and MySQL, errors ignored
+    cleanup: List[str] = field(default_factory=list)
+    pg_sql: str = None # Hand-written version for the native PostgreSQL target
+    group: str = None
+    sandbox: List[str] = None # Tables copied into a sandbox database for the entry's unit (None = shared objects)
+
+def load_test_catalog(path=CATALOG_FILE, variables: Dict = None, builder: 'DynamicQueryBuilder' = None) -> List[CatalogEntry]:
+    """
+    Reads a JSON test catalog: groups of queries with id, category, sql (a string or a list of lines),
+    kind, and optionally chain, depends_on, setup, cleanup, pg_sql and sandbox. $name placeholders are replaced
+    by the catalog variables, overridden by `variables`.
+    Generated entries ("generate": a DynamicQueryBuilder method, "count") need a builder.
+    """
+    with open(path) as f:
+        catalog = json.load(f)
+    values = dict(catalog.get('variables', {}), **(variables or {}))
+
+    def text(value):
+        if isinstance(value, list):
+            value = "\n".join(value)
+        return Template(value).safe_substitute(values) if value is not None else None
+
+    entries = []
+    for group in catalog['groups']:
+        for spec in group['queries']:
+            common = dict(chain=spec.get('chain'), depends_on=spec.get('depends_on', []), sandbox=spec.get('sandbox'),
+                          setup=[text(sql) for sql in spec.get('setup', [])],
+                          cleanup=[text(sql) for sql in spec.get('cleanup', [])], group=group['name'])
+            if 'generate' not in spec:
+                sql = text(spec['sql'])
+                entries.append(CatalogEntry(spec['id'], spec['category'], sql, spec.get('kind') or statement_kind(sql),
+                                            pg_sql=text(spec.get('pg_sql')), **common))
+                continue
+
+            if builder is None:
+                raise ValueError(f"Catalog entry {spec['id']} is generated: a DynamicQueryBuilder is needed")
+            generate = getattr(builder, spec['generate'])
+            for i in range(1, spec.get('count', 1) + 1):
+                kwargs = dict(spec.get('kwargs', {}))
+                if 'random_limit' in spec:
+                    kwargs['limit'] = random.randint(*spec['random_limit'])
+                generated = generate(**kwargs)
+                # (description, sql), or a list of them for a lifecycle
+                for desc, sql in (generated if isinstance(generated, list) else [generated]):
+                    entries.append(CatalogEntry(spec['id'].format(i=i), spec.get('category', desc), sql,
+                                                spec.get('kind') or statement_kind(sql), **common))
+
+    known = {e.query_id for e in entries}
+    for e in entries:
+        if set(e.depends_on) - known:
+            raise ValueError(f"Catalog entry {e.query_id} depends on unknown entries: {sorted(set(e.depends_on) - known)}")
+    return entries
+
+class CatalogScheduler:
+    """
+    Runs a test catalog with up to `workers` sessions per target.
+    A unit is a chain (its entries in catalog order, on one set of sessions) or a single entry.
+    Read-only units run concurrently on pooled sessions. A unit with a write, DDL or session
+    statement is a barrier: it runs alone on the suite sessions, after every previous unit and
+    before the next ones. A read that depends on a unit of the current parallel batch runs after
+    it, in the same unit.
+    With a SandboxManager, units with a 'sandbox' entry run on sandbox sessions instead, on copies
+    of the listed tables: they do not touch shared objects, so they run in the parallel batches.
+    Concurrent reads share the servers, so their latencies include that contention (workers=1:
+    everything runs sequentially on the suite sessions, sandboxed units on their sandbox).
+    """
+
+    UNTIMED_TARGETS = ('OpenHalo', 'MySQL')
+
+    def __init__(self, tester: DualQueryTester, entries: List[CatalogEntry], workers: int = 4,
+                 sandboxes: SandboxManager = None):
+        self.tester = tester
+        self.entries = entries
+        self.workers = max(1, workers)
+        self.sandboxes = sandboxes
+        self.group = None
+
+    def sandbox_tables(self, unit):
+        """Tables to copy for a sandboxed unit, None if it runs on the shared objects"""
+        if self.sandboxes is None or all(e.sandbox is None for e in unit):
+            return None
+        return {table for e in unit for table in e.sandbox or []}
+
+    def units(self):
+        """(entries, exclusive) in catalog order; a chain takes the place of its first entry"""
+        units, chains = [], {}
+        for entry in self.entries:
+            if entry.chain in chains:
+                chains[entry.chain].append(entry)
+                continue
+            unit = [entry]
+            if entry.chain:
+                chains[entry.chain] = unit
+            units.append(unit)
+        return [(unit, any(e.kind != 'read' for e in unit) and self.sandbox_tables(unit) is None) for unit in units]
+
+    def plan(self):
+        """Phases in order: ('parallel', [units]) or ('exclusive', [unit])"""
+        phases, batch, owner = [], [], {}
+        for unit, exclusive in self.units():
+            if exclusive:
+                if batch:
+                    phases.append(('parallel', batch))
+                    batch, owner = [], {}
+                phases.append(('exclusive', [unit]))
+                continue
+
+            deps = []
+            for dep_id in (d for e in unit for d in e.depends_on):
+                dep = owner.get(dep_id)
+                if dep is not None and all(dep is not d for d in deps):
+                    deps.append(dep)
+            if deps:
+                # Runs after (and with) the units it depends on
+                merged = deps[0]
+                for other in deps[1:]:
+                    merged.extend(other)
+                    batch = [u for u in batch if u is not other]
+                merged.extend(unit)
+                unit = merged
+            else:
+                batch.append(unit)
+            for e in unit:
+                owner[e.query_id] = unit
+        if batch:
+            phases.append(('parallel', batch))
+        return phases
+
+    def _header(self, unit):
+        if unit[0].group != self.group:
+            self.group = unit[0].group
+            print(f"\n--- {self.group} ---")
+
+    def _untimed(self, sessions, statements):
+        for target in self.UNTIMED_TARGETS:
+            conn = sessions.get(target)
+            for sql in statements if conn else []:
+                try:
+                    cursor = conn.cursor()
+                    cursor.execute(sql)
+                    if cursor.with_rows:
+                        cursor.fetchall()
+                    conn.commit()
+                    cursor.close()
+                except Exception:
+                    pass # e.g. dropping an index that does not exist yet
+
+    def _run_unit(self, unit, sessions):
+        for entry in unit:
+            self._untimed(sessions, entry.setup)
+            self.tester.test_query(entry.query_id, entry.category, entry.sql, pg_query=entry.pg_sql, sessions=sessions)
+            self._untimed(sessions, entry.cleanup)
+
+    def _run_pooled(self, unit):
+        """False if no session could be acquired (the unit is then run on the suite sessions)"""
+        tables = self.sandbox_tables(unit)
+        try:
+            if tables is None:
+                sessions = self.tester.db.acquire_sessions()
+            else:
+                sandbox = self.sandboxes.acquire(tables)
+                sessions = sandbox['sessions']
+        except Exception as e:
+            print(f"  ⚠ No {'sandbox' if tables is not None else 'parallel session'} available ({e}), "
+                  f"{unit[0].query_id} runs on the suite sessions")
+            return False
+        try:
+            self._run_unit(unit, sessions)
+        finally:
+            if tables is None:
+                self.tester.db.release_sessions(sessions)
+            else:
+                self.sandboxes.release(sandbox)
+        return True
+
+    def _provision(self):
+        """
+        Creates the sandbox templates; returns True if units are sandboxed. Without the privileges
+        (CREATE DATABASE), sandboxes are turned off and those units run alone on the suite sessions.
+        """
+        sandboxed = [self.sandbox_tables(unit) for unit, _ in self.units()]
+        sandboxed = [tables for tables in sandboxed if tables is not None]
+        if not sandboxed:
+            return False
+        print(f"\n🧪 Provisioning sandboxes for {len(sandboxed)} units")
+        self.sandboxes.teardown() # Leftovers of an aborted run
+        try:
+            self.sandboxes.prepare(set().union(*sandboxed))
+            return True
+        except Exception as e:
+            print(f"  ⚠ Sandboxes unavailable ({e}): these units run alone on the suite sessions")
+            self.sandboxes.teardown()
+            self.sandboxes = None
+            return False
+
+    def run(self):
+        first = len(self.tester.results)
+        start = time.perf_counter()
+        # Before planning: units whose sandbox is not available become exclusive
+        sandboxed = self._provision()
+
+        phases = self.plan()
+        parallel = sum(kind == 'parallel' for kind, _ in phases)
+        print(f"\n🗂 Test catalog: {len(self.entries)} tests, {sum(len(units) for _, units in phases)} units, "
+              f"{parallel} parallel batches, {self.workers} workers")
+        if self.workers > 1 and self.tester.server_stats:
+            print("⚠ Server statistics are per server: in parallel batches they include concurrent tests")
+
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for kind, units in phases:
+                    if kind == 'exclusive' or self.workers == 1:
+                        for unit in units:
+                            self._header(unit)
+                            if self.sandbox_tables(unit) is None or not self._run_pooled(unit):
+                                self._run_unit(unit, self.tester.db.sessions())
+                        continue
+                    futures = []
+                    for unit in units:
+                        self._header(unit)
+                        futures.append((unit, executor.submit(self._run_pooled, unit)))
+                    for unit, future in futures:
+                        if not future.result():
+                            self._run_unit(unit, self.tester.db.sessions())
+        finally:
+            if sandboxed:
+                self.sandboxes.teardown()
+        elapsed = time.perf_counter() - start
+
+        # Results in catalog order, whatever the order the workers finished in (the sort is stable)
+        order = {}
+        for i, e in enumerate(self.entries):
+            order.setdefault(e.query_id, i)
+        self.tester.results[first:] = sorted(self.tester.results[first:], key=lambda r: order.get(r.query_id, len(order)))
+        print(f"\n✓ Test catalog completed in {elapsed:.1f}s")
+        return elapsed
+
+
 class StressTester:
-    def __init__(self, db_config, num_threads=10, duration_seconds=5):
+    QUERY = "SELECT * FROM name_basics WHERE primaryprofession = 'actor' LIMIT 1"
+    CLIENT_CPU_LIMIT = 0.9 # CPU share of one core above which a load process is saturated
+    WORKER_LABEL = "threads"
+    SERIES_INTERVAL = 1.0 # Seconds per point of the time series
+
+    # Weighted query classes (generated by DynamicQueryBuilder), used instead of QUERY when a profile is set
+    WORKLOAD_PROFILES = {
+        'read_only':     {'point_lookup': 70, 'range_scan': 30},
+        # 80% reads / 15% aggregations / 5% writes
+        'mixed_80_15_5': {'point_lookup': 55, 'range_scan': 25, 'aggregation': 10, 'subquery': 5, 'dml': 5},
+        'write_heavy':   {'point_lookup': 40, 'range_scan': 10, 'dml': 50},
+    }
+
+    def __init__(self, db_config, num_threads=10, duration_seconds=5, target_qps=None, arrival='constant',
+                 warmup_seconds=0, num_processes=1, profile=None, table_name='name_basics', prepared=False,
+                 pool_size=None):
         self.db_config = db_config
         self.num_threads = num_threads
+        # num_threads is the total; with num_processes > 1 the threads are split across
+        # a process pool to get past the GIL of a single client process
+        self.num_processes = num_processes
         self.duration = duration_seconds
+        # Queries run during the warm-up are not recorded (TPS is computed on the steady-state window)
+        self.warmup = warmup_seconds
+        # Open loop: None = closed loop (next query sent when the previous one returns),
+        # otherwise queries are scheduled at target_qps with 'constant' or 'poisson' arrivals
+        self.target_qps = target_qps
+        self.arrival = arrival
+        # Workload profile: name in WORKLOAD_PROFILES or dict {query class: weight}, None = QUERY only
+        if isinstance(profile, str):
+            profile = self.WORKLOAD_PROFILES[profile]
+        self.profile = profile
+        self.table_name = table_name
+        # Prepared mode: each worker keeps one prepared handle per statement shape (binary protocol)
+        self.prepared = prepared
+        # Pooled mode: workers check a connection out of a shared pool of pool_size connections for each
+        # operation (reset on release), instead of keeping their own. None = one connection per worker
+        self.pool_size = pool_size
+        self.series_origin = time.time() + self.warmup # Reset by run_benchmark
+
+    def _build_operation(self, builder, query_class):
+        """List of SQL statements for one operation of the given class"""
+        if query_class == 'point_lookup':
+            return [builder.build_point_lookup()[1]]
+        elif query_class == 'range_scan':
+            return [builder.build_range_scan()[1]]
+        elif query_class == 'aggregation':
+            return [builder.build_aggregation()[1]]
+        elif query_class == 'subquery':
+            return [builder.build_subquery()[1]]
+        elif query_class == 'dml':
+            # The whole INSERT -> UPDATE -> SELECT -> DELETE lifecycle counts as one write operation
+            return [sql for _, sql in builder.build_dml_lifecycle()]
+        raise ValueError(f"Unknown query class: {query_class}")
+
+    def _execute_operation(self, conn, cursor, builder, handles=None):
+        """
+        Runs one operation (QUERY, or one drawn from the profile) and returns its query class.
+        handles: PreparedStatementCache of the worker in prepared mode, None = text protocol
+        """
+        if not self.profile:
+            if handles:
+                cursor = handles.execute(self.QUERY)
+            else:
+                cursor.execute(self.QUERY)
+            cursor.fetchall()
+            return None
+
+        query_class = random.choices(list(self.profile), weights=list(self.profile.values()))[0]
+        for sql in self._build_operation(builder, query_class):
+            if handles:
+                cursor = handles.execute(sql)
+            else:
+                cursor.execute(sql)
+            if cursor.with_rows:
+                cursor.fetchall()
+            else:
+                conn.commit()
+        return query_class
 
-    def _worker_task(self):
-        """Simulates an active user and measures latencies"""
+    def _new_stats(self):
+        return WorkerStats(series=LatencyTimeSeries(self.series_origin, self.SERIES_INTERVAL))
+
+    def _steady_start(self):
+        """Start of the common steady-state window, in this process' perf_counter time"""
+        return time.perf_counter() + (self.series_origin - time.time())
+
+    def _checkout(self, pool, steady_start):
+        """Connection, cursor (text protocol) or prepared handles for one operation, from the shared pool"""
+        conn = pool.acquire(record_wait=time.perf_counter() >= steady_start)
         try:
-            conn = mysql.connector.connect(**self.db_config)
-            cursor = conn.cursor()
-        except:
-            return [], 1 # Returns an empty list and 1 error
+            if self.prepared:
+                # Handles live as long as the server session of the connection
+                return conn, None, pool.session_data(conn).setdefault('handles', PreparedStatementCache(conn))
+            return conn, conn.cursor(), None
+        except Exception:
+            pool.release(conn, broken=True) # The caller never got it
+            raise
+
+    def _checkin(self, pool, conn, cursor, failed):
+        """Closes the cursor of the operation and gives its connection back to the pool"""
+        if cursor is not None:
+            try:
+                cursor.close()
+            except Exception:
+                failed = True
+        pool.release(conn, broken=failed)
+
+    def _worker_task(self, pool=None):
+        """Simulates an active user and measures latencies"""
+        stats = self._new_stats() # Local to the thread, merged in run_benchmark
+        builder = DynamicQueryBuilder(self.table_name) if self.profile else None
+        handles = None
+        conn = cursor = None
+        if pool is None:
+            try:
+                conn = mysql.connector.connect(**self.db_config)
+                # Profiles mix reads and writes: each statement is its own transaction
+                conn.autocommit = bool(self.profile)
+                cursor = conn.cursor()
+                handles = PreparedStatementCache(conn) if self.prepared else None
+            except:
+                stats.errors += 1
+                return stats # Returns empty stats and 1 error
 
-        latencies = [] # Storing the time of each query here
-        errors = 0
-        start_time = time.time()
+        steady_start = self._steady_start()
+        end_time = steady_start + self.duration
         
-        while time.time() - start_time < self.duration:
+        while time.perf_counter() < end_time:
+            failed = False
             try:
+                if pool:
+                    # Pool wait is recorded by the pool, not in the query latency
+                    conn, cursor, handles = self._checkout(pool, steady_start)
+
                 req_start = time.perf_counter() # Start timer
                 
-                # Simple read query
-                cursor.execute("SELECT * FROM name_basics WHERE primaryprofession = 'actor' LIMIT 1")
-                cursor.fetchall()
+                # Simple read query, or one operation of the workload profile
+                query_class = self._execute_operation(conn, cursor, builder, handles)
                 
                 req_end = time.perf_counter() # End timer
                 
-                # Add the duration in milliseconds (ms) to the list
-                latencies.append((req_end - req_start) * 1000)
+                # Record the duration in milliseconds (ms), once warmed up
+                if req_start >= steady_start:
+                    stats.record((req_end - req_start) * 1000, query_class)
                 
             except Exception:
-                errors += 1
-        
+                failed = True
+                if time.perf_counter() >= steady_start:
+                    stats.record_error()
+            if pool and conn is not None:
+                self._checkin(pool, conn, cursor, failed)
+                conn = None
+
+        if pool:
+            return stats
+        if handles:
+            stats.prepare.merge(handles.prepare_hist)
+            handles.close()
+        cursor.close()
         conn.close()
-        return latencies, errors
+        return stats
 
-    def run_benchmark(self, target_name):
-        print(f"\n🔥 STRESS TEST: {target_name} ({self.num_threads} threads, {self.duration}s)")
-        
-        all_latencies = []
-        total_errors = 0
-        
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.num_threads) as executor:
-            futures = [executor.submit(self._worker_task) for _ in range(self.num_threads)]
+    def _next_gap(self, rate):
+        """Time (s) between two intended sends for one worker"""
+        if self.arrival == 'poisson':
+            return random.expovariate(rate)
+        return 1.0 / rate
+
+    def _open_loop_worker_task(self, worker_index, pool=None):
+        """
+        Sends queries on a fixed schedule (open loop) at target_qps / num_threads.
+        Latency is measured from the intended send time, not the actual one:
+        when the server stalls, the queued requests keep their original
+        schedule and the stall shows up in the percentiles
+        (coordinated-omission correction).
+        """
+        stats = self._new_stats()
+        builder = DynamicQueryBuilder(self.table_name) if self.profile else None
+        rate = self.target_qps / self.num_threads
+        handles = None
+        conn = cursor = None
+        if pool is None:
+            try:
+                conn = mysql.connector.connect(**self.db_config)
+                # Profiles mix reads and writes: each statement is its own transaction
+                conn.autocommit = bool(self.profile)
+                cursor = conn.cursor()
+                handles = PreparedStatementCache(conn) if self.prepared else None
+            except:
+                stats.errors += 1
+                return stats
+
+        steady_start = self._steady_start()
+        start_time = steady_start - self.warmup
+        end_time = steady_start + self.duration
+
+        # Workers are staggered so that constant arrivals are evenly spread
+        if self.arrival == 'poisson':
+            intended = start_time + random.expovariate(rate)
+        else:
+            intended = start_time + worker_index / (rate * self.num_threads)
+
+        while intended < end_time:
+            now = time.perf_counter()
+            if now >= end_time:
+                stats.backlog += 1
+                intended += self._next_gap(rate)
+                continue
+            if intended > now:
+                time.sleep(intended - now)
+            failed = False
+            try:
+                if pool:
+                    # Measured from the intended send time, the latency includes the pool wait
+                    conn, cursor, handles = self._checkout(pool, steady_start)
+                query_class = self._execute_operation(conn, cursor, builder, handles)
+                if intended >= steady_start:
+                    stats.record((time.perf_counter() - intended) * 1000, query_class)
+            except Exception:
+                failed = True
+                if intended >= steady_start:
+                    stats.record_error()
+            if pool and conn is not None:
+                self._checkin(pool, conn, cursor, failed)
+                conn = None
+            intended += self._next_gap(rate)
+
+        if pool:
+            return stats
+        if handles:
+            stats.prepare.merge(handles.prepare_hist)
+            handles.close()
+        cursor.close()
+        conn.close()
+        return stats
+
+    def _run_workers(self, worker_indexes):
+        """
+        Runs the given workers in a thread pool of this process and returns their merged
+        WorkerStats, with the client CPU usage (CPU seconds / wall seconds, 1.0 = one full core).
+        """
+        stats = self._new_stats()
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+
+        pool = None
+        if self.pool_size:
+            # One pool per load process, sized by its share of the workers
+            size = max(1, round(self.pool_size * len(worker_indexes) / self.num_threads))
+            # Prepared handles would not survive a session reset: they are kept with the connection instead
+            pool = ConnectionPool(self.db_config, size, reset_session=not self.prepared,
+                                  autocommit=bool(self.profile))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(worker_indexes)) as executor:
+            if self.target_qps:
+                futures = [executor.submit(self._open_loop_worker_task, i, pool) for i in worker_indexes]
+            else:
+                futures = [executor.submit(self._worker_task, pool) for _ in worker_indexes]
             for future in concurrent.futures.as_completed(futures):
-                lats, e = future.result()
-                all_latencies.extend(lats) # We merge the results from all threads
-                total_errors += e
+                stats.merge(future.result()) # We merge the histograms from all threads
 
-        total_queries = len(all_latencies)
+        if pool:
+            stats.pool_wait.merge(pool.wait_hist)
+            for data in pool.sessions():
+                if 'handles' in data:
+                    stats.prepare.merge(data['handles'].prepare_hist)
+            pool.close()
+
+        stats.cpu_usages.append((time.process_time() - cpu_start) / max(time.perf_counter() - wall_start, 1e-9))
+        return stats
+
+    def run_benchmark(self, target_name):
+        if self.target_qps:
+            print(f"\n🔥 STRESS TEST (open loop): {target_name} ({self.target_qps} QPS {self.arrival}, "
+                  f"{self.num_threads} {self.WORKER_LABEL}, {self.duration}s)")
+        else:
+            print(f"\n🔥 STRESS TEST: {target_name} ({self.num_threads} {self.WORKER_LABEL}, {self.duration}s)")
+        if self.num_processes > 1:
+            print(f"  (spread over {self.num_processes} processes)")
+        if self.warmup:
+            print(f"  (warm-up: {self.warmup}s, not recorded)")
+        if self.prepared:
+            print("  (prepared statements, binary protocol)")
+        if self.pool_size:
+            print(f"  (connection pool: {self.pool_size} connections)")
+
+        # All workers (threads and processes) share the same steady-state window
+        self.series_origin = time.time() + self.warmup
+        
+        if self.num_processes > 1:
+            # Each process runs its own share of the threads, then the histograms are merged here
+            stats = self._new_stats()
+            nb_processes = min(self.num_processes, self.num_threads)
+            shares = [list(range(i, self.num_threads, nb_processes)) for i in range(nb_processes)]
+            with concurrent.futures.ProcessPoolExecutor(max_workers=nb_processes) as executor:
+                futures = [executor.submit(self._run_workers, share) for share in shares]
+                for future in concurrent.futures.as_completed(futures):
+                    stats.merge(future.result())
+        else:
+            stats = self._run_workers(list(range(self.num_threads)))
+
+        result = self._build_result(stats.hist, stats.errors)
+        if self.target_qps:
+            print(f"  ➜ Offered / Achieved: {self.target_qps:.0f} / {result['tps']:.0f} QPS, {stats.backlog} requests never sent")
+            result['target_qps'] = self.target_qps
+            result['backlog'] = stats.backlog
+        if stats.classes:
+            result['classes'] = self._build_class_results(stats.classes)
+        if stats.prepare.count:
+            # One prepare per statement shape and worker, outside the latencies above once warmed up
+            print(f"  ➜ Prepare (binary protocol): {stats.prepare.count} statements, "
+                  f"avg {stats.prepare.mean():.2f} ms, P95 {stats.prepare.percentile(95):.2f} ms")
+            result['prepare'] = {"count": stats.prepare.count, "avg_latency": stats.prepare.mean(),
+                                 "p95_latency": stats.prepare.percentile(95)}
+        if stats.pool_wait.count:
+            pool_wait = stats.pool_wait.summary()
+            print(f"  ➜ Pool wait        : avg {stats.pool_wait.mean():.2f} / P95 {pool_wait['p95']:.2f} / "
+                  f"P99 {pool_wait['p99']:.2f} / Max {pool_wait['max']:.2f} ms")
+            result['pool_wait'] = {"avg": stats.pool_wait.mean(), "p95": pool_wait['p95'],
+                                   "p99": pool_wait['p99'], "max": pool_wait['max']}
+        result['timeseries'] = stats.series.to_list(self.duration)
+
+        # Self-check: a load process close to one full core means we measure the client (GIL), not the database
+        client_cpu = max(stats.cpu_usages)
+        result['client_cpu'] = client_cpu
+        if client_cpu >= self.CLIENT_CPU_LIMIT:
+            print(f"  ⚠ Client CPU is the bottleneck ({client_cpu:.0%} of a core in one load process): "
+                  f"results are capped by the harness, increase num_processes")
+        return result
+
+    def _build_class_results(self, class_hists):
+        """Prints and returns throughput and latency per query class"""
+        print(f"  {'Query class':<14} | {'Share':>6} | {'TPS':>9} | {'Avg (ms)':>9} | {'P95 (ms)':>9} | {'P99 (ms)':>9}")
+        total = sum(h.count for h in class_hists.values()) or 1
+        classes = {}
+        for query_class, h in sorted(class_hists.items(), key=lambda item: -item[1].count):
+            classes[query_class] = {
+                "count": h.count,
+                "tps": h.count / self.duration if self.duration > 0 else 0,
+                "avg_latency": h.mean(),
+                "p95_latency": h.percentile(95),
+                "p99_latency": h.percentile(99)
+            }
+            c = classes[query_class]
+            print(f"  {query_class:<14} | {h.count / total:>6.1%} | {c['tps']:>9.1f} | {c['avg_latency']:>9.2f} | "
+                  f"{c['p95_latency']:>9.2f} | {c['p99_latency']:>9.2f}")
+        return classes
+
+    def _build_result(self, hist, total_errors):
+        """Prints and returns the statistics of a merged histogram"""
+        total_queries = hist.count
         
         # Statistical calculations
         if self.duration > 0:
@@ -641,378 +3591,658 @@ class StressTester:
         else:
             tps = 0
             
-        if all_latencies:
-            avg_lat = mean(all_latencies)
-            all_latencies.sort()
-            # P95: Latency worse than 95% of users
-            p95_lat = all_latencies[int(len(all_latencies) * 0.95)]
-        else:
-            avg_lat = 0
-            p95_lat = 0
+        avg_lat = hist.mean()
+        stats = hist.summary()
+        # P95: Latency worse than 95% of users
+        p95_lat = stats['p95']
 
         print(f"  ➜ TPS (Transac/Sec): {tps:.2f}")
         print(f"  ➜ Average Latency  : {avg_lat:.2f} ms")
         print(f"  ➜ P95 Latency      : {p95_lat:.2f} ms")
+        print(f"  ➜ P99 / P99.9 / Max: {stats['p99']:.2f} / {stats['p99.9']:.2f} / {stats['max']:.2f} ms")
         print(f"  ➜ Errors           : {total_errors}")
         
         # We return a dictionary, not just a float
         return {
             "tps": tps,
             "avg_latency": avg_lat,
-            "p95_latency": p95_lat
+            "p50_latency": stats['p50'],
+            "p90_latency": stats['p90'],
+            "p95_latency": p95_lat,
+            "p99_latency": stats['p99'],
+            "p999_latency": stats['p99.9'],
+            "max_latency": stats['max'],
+            "errors": total_errors
         }
     
-def test_bulk_insert(target_name, config, batch_size=5000):
-    print(f"\n📦 BULK INSERT TEST: {target_name} ({batch_size} rows)")
+class AsyncStressTester(StressTester):
+    """
+    asyncio backend: many mostly idle sessions per process over non-blocking connections
+    (mysql.connector.aio). Each session sends the query, then waits a random think time.
+    Same run_benchmark result shape as StressTester; num_threads is the number of sessions.
+    """
+    WORKER_LABEL = "async sessions"
+
+    def __init__(self, db_config, num_sessions=2000, duration_seconds=30, think_time_seconds=1.0,
+                 warmup_seconds=5, num_processes=1, connect_concurrency=100):
+        super().__init__(db_config, num_threads=num_sessions, duration_seconds=duration_seconds,
+                         warmup_seconds=warmup_seconds, num_processes=num_processes)
+        self.think_time = think_time_seconds # Mean idle time between two queries of a session
+        self.connect_concurrency = connect_concurrency # Limits the connection storm at startup
+        if mysql_aio is None:
+            raise RuntimeError("AsyncStressTester needs mysql-connector-python >= 9.0 (mysql.connector.aio)")
+
+    async def _session_task(self, stats, connect_gate, steady_start, end_time):
+        """One application session (latencies and errors go to the stats shared by the event loop)"""
+        try:
+            async with connect_gate:
+                conn = await mysql_aio.connect(**self.db_config)
+            cursor = await conn.cursor()
+        except Exception:
+            stats.errors += 1
+            return
+
+        # Sessions do not start in lockstep
+        if self.think_time > 0:
+            await asyncio.sleep(random.uniform(0, self.think_time))
+
+        while time.perf_counter() < end_time:
+            try:
+                req_start = time.perf_counter()
+                await cursor.execute(self.QUERY)
+                await cursor.fetchall()
+                if req_start >= steady_start:
+                    # The event loop is single-threaded, the stats can be shared by all sessions
+                    stats.record((time.perf_counter() - req_start) * 1000)
+            except Exception:
+                if time.perf_counter() >= steady_start:
+                    stats.record_error()
+            if self.think_time > 0:
+                await asyncio.sleep(random.expovariate(1.0 / self.think_time))
+
+        try:
+            await cursor.close()
+            await conn.close()
+        except Exception:
+            pass
+
+    async def _run_sessions(self, nb_sessions):
+        stats = self._new_stats()
+        connect_gate = asyncio.Semaphore(self.connect_concurrency)
+        steady_start = self._steady_start()
+        end_time = steady_start + self.duration
+        await asyncio.gather(*[self._session_task(stats, connect_gate, steady_start, end_time)
+                               for _ in range(nb_sessions)])
+        return stats
+
+    def _run_workers(self, worker_indexes):
+        """Runs one event loop with the given sessions (same return value as StressTester._run_workers)"""
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        stats = asyncio.run(self._run_sessions(len(worker_indexes)))
+        stats.cpu_usages.append((time.process_time() - cpu_start) / max(time.perf_counter() - wall_start, 1e-9))
+        return stats
+
+class ConnectionPerRequestTester(StressTester):
+    """
+    Stress test where every request opens its own connection, runs QUERY and closes it
+    (no pooling, e.g. CGI / serverless clients). Latencies include connect, auth and teardown.
+    """
+    WORKER_LABEL = "threads, connection per request"
+
+    def _worker_task(self, pool=None):
+        stats = self._new_stats()
+        steady_start = self._steady_start()
+        end_time = steady_start + self.duration
+
+        while time.perf_counter() < end_time:
+            try:
+                req_start = time.perf_counter()
+                conn = mysql.connector.connect(**self.db_config)
+                try:
+                    self._execute_operation(conn, conn.cursor(), None)
+                finally:
+                    conn.close()
+                if req_start >= steady_start:
+                    stats.record((time.perf_counter() - req_start) * 1000)
+            except Exception:
+                if time.perf_counter() >= steady_start:
+                    stats.record_error()
+        return stats
+
+def run_connection_burst(config, burst_size, timeout=30):
+    """
+    Opens burst_size connections at the same instant (threads released by a barrier), keeps them all
+    open, runs one query on each (first query of a fresh session), then closes them.
+    Returns the connect latency percentiles, connections/sec, failure rate and teardown time.
+    """
+    connect_hist, first_query_hist, close_hist = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    spans = [] # (connect start, connect end) of the successful connections
+    failures = []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(burst_size)
+    all_open = threading.Barrier(burst_size)
+
+    def client():
+        conn = None
+        try:
+            start_gate.wait(timeout)
+            t0 = time.perf_counter()
+            conn = mysql.connector.connect(**config)
+            t1 = time.perf_counter()
+            with lock:
+                connect_hist.record((t1 - t0) * 1000)
+                spans.append((t0, t1))
+        except Exception as e:
+            with lock:
+                failures.append(str(e).splitlines()[0][:100] if str(e) else type(e).__name__)
+        try:
+            all_open.wait(timeout) # All sessions are open at the same time (failed clients wait too)
+        except threading.BrokenBarrierError:
+            pass
+        if conn is None:
+            return
+        try:
+            t0 = time.perf_counter()
+            cursor = conn.cursor()
+            cursor.execute(StressTester.QUERY)
+            cursor.fetchall()
+            t1 = time.perf_counter()
+            conn.close()
+            t2 = time.perf_counter()
+            with lock:
+                first_query_hist.record((t1 - t0) * 1000)
+                close_hist.record((t2 - t1) * 1000)
+        except Exception as e:
+            with lock:
+                failures.append(str(e).splitlines()[0][:100])
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=burst_size) as executor:
+        for f in [executor.submit(client) for _ in range(burst_size)]:
+            f.result()
+
+    connected = len(spans)
+    window = max(t1 for _, t1 in spans) - min(t0 for t0, _ in spans) if spans else 0
+    connect = connect_hist.summary()
+    result = {
+        "burst_size": burst_size,
+        "connected": connected,
+        "failure_rate": len(failures) / burst_size,
+        "connections_per_sec": connected / window if window > 0 else 0,
+        "connect_p50": connect['p50'], "connect_p95": connect['p95'],
+        "connect_p99": connect['p99'], "connect_max": connect['max'],
+        "first_query_avg": first_query_hist.mean(),
+        "close_avg": close_hist.mean(),
+        "errors": sorted(set(failures))[:5]
+    }
+    print(f"  {burst_size:>6} | {connected:>9} | {result['failure_rate']:>7.1%} | {result['connections_per_sec']:>8.0f} | "
+          f"{connect['p50']:>8.2f} | {connect['p95']:>8.2f} | {connect['p99']:>8.2f} | {connect['max']:>8.2f} | "
+          f"{result['first_query_avg']:>8.2f} | {result['close_avg']:>7.2f}")
+    return result
+
+def run_connection_benchmark(target_name, config, burst_sizes=(10, 50, 100, 200), num_threads=10, duration_seconds=5):
+    """
+    Connection storms of increasing size, then connection-per-request vs persistent sessions
+    under the same closed-loop load.
+    """
+    print(f"\n🔌 CONNECTION STORM: {target_name}")
+    print(f"  {'Burst':>6} | {'Connected':>9} | {'Failed':>7} | {'Conn/s':>8} | {'P50 (ms)':>8} | {'P95 (ms)':>8} | "
+          f"{'P99 (ms)':>8} | {'Max (ms)':>8} | {'1st qry':>8} | {'Close':>7}")
+    bursts = []
+    for burst_size in burst_sizes:
+        try:
+            bursts.append(run_connection_burst(config, burst_size))
+        except Exception as e:
+            print(f"  {burst_size:>6} | failed: {e}")
+
+    persistent = StressTester(config, num_threads=num_threads, duration_seconds=duration_seconds).run_benchmark(
+        f"{target_name} (persistent sessions)")
+    per_request = ConnectionPerRequestTester(config, num_threads=num_threads, duration_seconds=duration_seconds).run_benchmark(
+        f"{target_name} (connection per request)")
+    if persistent['tps'] > 0:
+        print(f"  ➜ Connection per request: {per_request['tps'] / persistent['tps']:.1%} of the persistent TPS, "
+              f"+{per_request['avg_latency'] - persistent['avg_latency']:.2f} ms average latency")
+    return {"bursts": bursts, "persistent": persistent, "per_request": per_request}
+
+def plot_connection_storm(connection_data, filename="benchmark_connection_storm.png"):
+    """Connect latency and connections/sec vs burst size, one curve per target"""
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    colors = {'OpenHalo': '#4CAF50', 'MySQL': '#2196F3'}
+
+    for target, data in connection_data.items():
+        bursts = data['bursts']
+        sizes = [b['burst_size'] for b in bursts]
+        color = colors.get(target)
+        ax1.plot(sizes, [b['connect_p50'] for b in bursts], marker='o', color=color, label=f"{target} P50")
+        ax1.plot(sizes, [b['connect_p99'] for b in bursts], marker='x', linestyle='--', color=color, label=f"{target} P99")
+        ax2.plot(sizes, [b['connections_per_sec'] for b in bursts], marker='o', color=color, label=target)
+
+    ax1.set_title('Connect Latency vs Burst Size\n(Lower is better)', fontsize=12, fontweight='bold')
+    ax1.set_xlabel('Simultaneous connects')
+    ax1.set_ylabel('Milliseconds (ms)')
+    ax1.set_yscale('log')
+    ax2.set_title('Connections per Second vs Burst Size\n(Higher is better)', fontsize=12, fontweight='bold')
+    ax2.set_xlabel('Simultaneous connects')
+    ax2.set_ylabel('Connections / Second')
+    for ax in (ax1, ax2):
+        ax.grid(True, linestyle='--', alpha=0.5)
+        ax.legend()
+
+    plt.suptitle("Connection Storm OpenHalo vs MySQL", fontsize=16)
+    plt.tight_layout()
+    plt.savefig(filename, dpi=300)
+    print(f"📊 Connection Storm Graph generated: {filename}")
+
+BULK_METHODS = ('executemany', 'multirow', 'load_data')
+
+def _bulk_write_tsv(batch):
+    """Writes a batch to a temporary TSV file for LOAD DATA LOCAL INFILE, returns its path"""
+    with tempfile.NamedTemporaryFile('w', suffix='.tsv', delete=False) as f:
+        f.writelines(f"{i}\t{val}\n" for i, val in batch)
+    return f.name
+
+def _bulk_load_batches(method, conn, batches, commit_every):
+    """
+    Sends the batches of one loader connection; commit_every = batches per commit (0 = once at the end).
+    For load_data, the batches are the paths of their TSV files.
+    """
+    # The text cursor rewrites executemany INSERTs into one multi-row statement (same as 'multirow'):
+    # the prepared cursor sends one COM_STMT_EXECUTE per row
+    cursor = conn.cursor(prepared=True) if method == 'executemany' else conn.cursor()
+    for n, batch in enumerate(batches, 1):
+        if method == 'executemany':
+            cursor.executemany("INSERT INTO bulk_test (id, val) VALUES (%s, %s)", batch)
+        elif method == 'multirow':
+            # Values are generated by us (int + plain ascii), so they are inlined without escaping
+            values = ",".join(f"({i},'{val}')" for i, val in batch)
+            cursor.execute(f"INSERT INTO bulk_test (id, val) VALUES {values}")
+        else:
+            cursor.execute(f"LOAD DATA LOCAL INFILE '{batch}' INTO TABLE bulk_test "
+                           "FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' (id, val)")
+        if commit_every and n % commit_every == 0:
+            conn.commit()
+    conn.commit()
+    cursor.close()
+
+def test_bulk_insert(target_name, config, batch_size=5000, method='executemany', commit_every=1,
+                     connections=1, total_rows=None):
+    """
+    Times the load of total_rows (default: one batch) into bulk_test with one ingest method,
+    split in batches of batch_size over `connections` parallel connections.
+    Returns rows/sec and MB/s (payload measured as tab-separated text), or None on failure.
+    """
+    total_rows = total_rows or batch_size
+    print(f"\n📦 BULK INSERT TEST: {target_name} ({total_rows} rows, {method}, batch {batch_size}, "
+          f"commit every {commit_every or 'end'}, {connections} conn)")
+    conns = []
+    files = []
     try:
-        conn = mysql.connector.connect(**config)
+        # LOAD DATA LOCAL needs the client-side opt-in (and local_infile=ON on the server)
+        conn_config = dict(config, allow_local_infile=True) if method == 'load_data' else config
+        conn = mysql.connector.connect(**conn_config)
+        conns.append(conn) # Every connection opened is closed in finally
         cursor = conn.cursor()
         cursor.execute("DROP TABLE IF EXISTS bulk_test")
         cursor.execute("CREATE TABLE bulk_test (id INT, val VARCHAR(50))")
-        
-        data = [(i, f"val_{i}") for i in range(batch_size)]
-        
-        start = time.perf_counter()
-        # executemany is optimized for bulk
-        cursor.executemany("INSERT INTO bulk_test (id, val) VALUES (%s, %s)", data)
         conn.commit()
+
+        data = [(i, f"val_{i}") for i in range(total_rows)]
+        payload_mb = sum(len(f"{i}\t{val}\n") for i, val in data) / 1e6
+        batches = [data[i:i + batch_size] for i in range(0, total_rows, batch_size)]
+        if method == 'load_data':
+            files = batches = [_bulk_write_tsv(batch) for batch in batches]
+
+        # Connections and TSV files are ready before the clock starts: only the ingest itself is timed
+        for _ in range(connections - 1):
+            conns.append(mysql.connector.connect(**conn_config))
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=connections) as executor:
+            futures = [executor.submit(_bulk_load_batches, method, c, batches[i::connections], commit_every)
+                       for i, c in enumerate(conns)]
+            for f in futures:
+                f.result()
         end = time.perf_counter()
-        
-        duration_ms = (end - start) * 1000
-        print(f"  ➜ Time: {duration_ms:.2f} ms")
-        print(f"  ➜ Rate: {batch_size / (end - start):.0f} rows/sec")
-        
+
+        cursor.execute("SELECT COUNT(*) FROM bulk_test")
+        loaded = cursor.fetchone()[0]
+        if loaded != total_rows:
+            print(f"  ➜ ⚠️ {loaded} rows in bulk_test, expected {total_rows}")
+
+        duration = end - start
+        print(f"  ➜ Time: {duration * 1000:.2f} ms")
+        print(f"  ➜ Rate: {total_rows / duration:.0f} rows/sec, {payload_mb / duration:.2f} MB/s")
+
         cursor.execute("DROP TABLE bulk_test")
-        conn.close()
+        return {"method": method, "batch_size": batch_size, "commit_every": commit_every,
+                "connections": connections, "rows": loaded, "seconds": duration,
+                "rows_per_sec": total_rows / duration, "mb_per_sec": payload_mb / duration}
     except Exception as e:
         print(f"  ➜ Failed: {e}")
+        return None
+    finally:
+        for c in conns:
+            try:
+                c.close()
+            except Exception:
+                pass
+        for path in files:
+            os.remove(path)
+
+def run_bulk_ingest_matrix(target_name, config, methods=BULK_METHODS, batch_sizes=(1000, 10000),
+                           commit_intervals=(1, 0), connections=(1, 4), total_rows=20000):
+    """Runs test_bulk_insert for every method x batch size x commit interval x connection count"""
+    cells = []
+    for method in methods:
+        for batch_size in batch_sizes:
+            for commit_every in commit_intervals:
+                for conn_count in connections:
+                    cell = test_bulk_insert(target_name, config, batch_size, method, commit_every,
+                                            conn_count, total_rows)
+                    if cell:
+                        cells.append(cell)
+    return cells
+
+def print_bulk_ingest_matrix(matrix_data):
+    """Side-by-side rows/sec and MB/s of each cell for every target"""
+    targets = list(matrix_data)
+    print("\n📦 BULK INGEST MATRIX (rows/sec | MB/s)")
+    print(f"  {'method':<12} {'batch':>6} {'commit':>6} {'conn':>4}  " + "  ".join(f"{t:>22}" for t in targets))
+    keys = []
+    for cells in matrix_data.values():
+        for c in cells:
+            key = (c['method'], c['batch_size'], c['commit_every'], c['connections'])
+            if key not in keys:
+                keys.append(key)
+    for key in keys:
+        columns = []
+        for t in targets:
+            cell = next((c for c in matrix_data[t] if
+                         (c['method'], c['batch_size'], c['commit_every'], c['connections']) == key), None)
+            columns.append(f"{cell['rows_per_sec']:>12.0f} | {cell['mb_per_sec']:>7.2f}" if cell else f"{'failed':>22}")
+        method, batch_size, commit_every, conn_count = key
+        print(f"  {method:<12} {batch_size:>6} {commit_every or 'end':>6} {conn_count:>4}  " + "  ".join(columns))
+
+def detect_saturation_knee(points, min_gain=0.10):
+    """
+    Returns the concurrency level where throughput stops scaling:
+    the last level before TPS grows by less than min_gain (10%) from one step to the next.
+    """
+    if not points:
+        return None
+    for prev, cur in zip(points, points[1:]):
+        if prev['tps'] <= 0 or cur['tps'] < prev['tps'] * (1 + min_gain):
+            return prev['threads']
+    return points[-1]['threads'] # Still scaling at the highest level tested
+
+def run_scalability_sweep(target_name, config, levels=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+                          warmup_seconds=2, duration_seconds=5, num_processes=1, profile=None, prepared=False):
+    """Runs the stress test at each concurrency level and records TPS and latency percentiles"""
+    print(f"\n📈 SCALABILITY SWEEP: {target_name} (levels: {list(levels)})")
+    points = []
+    for threads in levels:
+        stress = StressTester(config, num_threads=threads, duration_seconds=duration_seconds,
+                              warmup_seconds=warmup_seconds, num_processes=num_processes, profile=profile,
+                              prepared=prepared)
+        res = stress.run_benchmark(f"{target_name} @ {threads} threads")
+        res['threads'] = threads
+        points.append(res)
+
+    knee = detect_saturation_knee(points)
+    peak = max(points, key=lambda p: p['tps'])
+    print(f"  ➜ Peak TPS: {peak['tps']:.0f} at {peak['threads']} threads")
+    print(f"  ➜ Saturation knee: {knee} threads")
+    return {"points": points, "knee": knee}
+
+def plot_scalability_sweep(sweep_data, filename="benchmark_scalability_sweep.png"):
+    """TPS and latency percentiles vs concurrency, one curve per target"""
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    colors = {'OpenHalo': '#4CAF50', 'MySQL': '#2196F3'}
+
+    for target, data in sweep_data.items():
+        points = data['points']
+        threads = [p['threads'] for p in points]
+        color = colors.get(target)
+
+        ax1.plot(threads, [p['tps'] for p in points], marker='o', color=color, label=target)
+        ax2.plot(threads, [p['p95_latency'] for p in points], marker='o', color=color, label=f"{target} P95")
+        ax2.plot(threads, [p['p99_latency'] for p in points], marker='x', linestyle='--', color=color, label=f"{target} P99")
+
+        if data['knee'] is not None:
+            ax1.axvline(data['knee'], color=color, linestyle=':', alpha=0.7)
+            ax1.annotate(f"knee {target}: {data['knee']}", xy=(data['knee'], max(p['tps'] for p in points)),
+                         xytext=(5, -15), textcoords="offset points", fontsize=8, color=color)
+
+    ax1.set_title('Throughput vs Concurrency\n(Higher is better)', fontsize=12, fontweight='bold')
+    ax1.set_xlabel('Concurrent threads')
+    ax1.set_ylabel('Transactions / Second')
+    ax1.set_xscale('log', base=2)
+    ax1.grid(True, linestyle='--', alpha=0.5)
+    ax1.legend()
+
+    ax2.set_title('Latency vs Concurrency\n(Lower is better)', fontsize=12, fontweight='bold')
+    ax2.set_xlabel('Concurrent threads')
+    ax2.set_ylabel('Milliseconds (ms)')
+    ax2.set_xscale('log', base=2)
+    ax2.set_yscale('log')
+    ax2.grid(True, linestyle='--', alpha=0.5)
+    ax2.legend()
+
+    plt.suptitle("Scalability Sweep OpenHalo vs MySQL", fontsize=16)
+    plt.tight_layout()
+    plt.savefig(filename, dpi=300)
+    print(f"📊 Scalability Graph generated: {filename}")
+
+def plot_stress_timeseries(results_data, filename="benchmark_timeseries.png"):
+    """Per-second TPS, latency and errors of each stress run (shows checkpoint / autovacuum stalls)"""
+    fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(14, 10), sharex=True)
+    colors = {'OpenHalo': '#4CAF50', 'MySQL': '#2196F3'}
+
+    for target, res in results_data.items():
+        points = res.get('timeseries', [])
+        if not points:
+            continue
+        t = [p['t'] for p in points]
+        color = colors.get(target)
+        ax1.plot(t, [p['tps'] for p in points], color=color, label=target)
+        ax2.plot(t, [p['p50_latency'] for p in points], color=color, linestyle=':', label=f"{target} P50")
+        ax2.plot(t, [p['p99_latency'] for p in points], color=color, label=f"{target} P99")
+        ax3.step(t, [p['errors'] for p in points], where='post', color=color, label=target)
+
+    ax1.set_title('Throughput per second', fontsize=12, fontweight='bold')
+    ax1.set_ylabel('Transactions / Second')
+    ax2.set_title('Latency per second', fontsize=12, fontweight='bold')
+    ax2.set_ylabel('Milliseconds (ms)')
+    ax2.set_yscale('log')
+    ax3.set_title('Errors per second', fontsize=12, fontweight='bold')
+    ax3.set_ylabel('Errors')
+    ax3.set_xlabel('Time since start of measurement (s)')
+    for ax in (ax1, ax2, ax3):
+        ax.grid(True, linestyle='--', alpha=0.5)
+        ax.legend()
+
+    plt.suptitle("Stress Test Time Series OpenHalo vs MySQL", fontsize=16)
+    plt.tight_layout()
+    plt.savefig(filename, dpi=300)
+    print(f"📊 Time Series Graph generated: {filename}")
 
 def main():
     # --- Configuration ---
     openhalo_config = {'host': 'localhost', 'port': 3306, 'user': 'halo', 'password': 'halo', 'database': 'testdb'}
     mysql_config = {'host': 'localhost', 'port': 3309, 'user': 'halo', 'password': 'halo', 'database': 'testdb'}
+
+    # Native PostgreSQL access to the OpenHalo backend (port 5434 in compose.yaml, needs psycopg2), None = not used
+    # e.g. {'host': 'localhost', 'port': 5434, 'user': 'halo', 'password': 'halo', 'dbname': 'testdb'}
+    # The connection must resolve the tables of the MySQL database, e.g. 'options': '-c search_path=testdb'
+    openhalo_pg_config = None
+
+    # Native PostgreSQL baseline (needs openhalo_pg_config): three-way report MySQL / OpenHalo / PostgreSQL
+    pg_baseline = False
+
+    # Load the IMDB dumps (DatabasesIMDB/) into both engines before the tests (drops and recreates name_basics)
+    # MySQL gets name_basics_mysql.sql; OpenHalo gets name_basics_postgres.sql over its PostgreSQL port if
+    # openhalo_pg_config is set, otherwise name_basics_mysql.sql through its MySQL port
+    load_imdb_dumps = False
+    loader_workers = 4
+
+    # Synthetic dataset at a scale factor from 1 to 1000 (1x = 10,000 people, 2,000 films), None = not used.
+    # Drops and recreates name_basics, films and film_actor on both engines with identical seeded data
+    synthetic_scale = None
+    synthetic_seed = 42
+
+    # Chunked checksum of name_basics / films / film_actor between OpenHalo and MySQL before the tests
+    check_table_consistency = False
+
+    # Bulk ingest matrix (opt-in, drops and reloads bulk_test for every cell; False = one multi-row cell of 5000 rows):
+    # 'executemany', 'multirow' (one INSERT ... VALUES (...),(...) per batch),
+    # 'load_data' (LOAD DATA LOCAL INFILE, needs local_infile=ON on the server); commit interval in batches, 0 = at the end
+    bulk_matrix = False
+    bulk_methods = ['executemany', 'multirow', 'load_data']
+    bulk_batch_sizes = [1000, 10000]
+    bulk_commit_intervals = [1, 0]
+    bulk_connections = [1, 4]
+    bulk_total_rows = 20000
+
+    # Prepared statements: literals become parameters and queries run on reused server-side statement
+    # handles (binary protocol) in the compatibility tests and stress tests; prepare cost is reported apart
+    prepared_statements = False
+
+    # Server-side statistics around each test: performance_schema digests on MySQL, pg_stat_statements on
+    # OpenHalo through openhalo_pg_config (without it, OpenHalo is not collected)
+    collect_server_stats = False
+
+    # EXPLAIN both engines for queries slower on OpenHalo by more than this ratio (None = disabled).
+    # The OpenHalo plan (EXPLAIN ANALYZE) needs openhalo_pg_config
+    explain_slow_ratio = None
+
+    # Adaptive sampling: repeat each SELECT until the 95% CI of its median is narrower than ci_target x median
+    # (e.g. 0.05), within ci_budget_seconds per query and engine (None = fixed iteration count)
+    ci_target = None
+    ci_budget_seconds = 5.0
+
+    # Run history (SQLite, None = not recorded): compare runs with
+    #   python openhalo_test_suite.py runs / compare <baseline_run> [<run>]
+    history_db = "openhalo_run_history.db"
+    openhalo_build = None # e.g. "openhalo-1.0.14"; None = SELECT VERSION() over the MySQL port
+    run_label = None
+    # Measured runs per SELECT when the history is recorded: with 3 vs 3 latencies the U test can never
+    # be significant, and 5 vs 5 (RunHistoryStore.MIN_SAMPLES) rarely survives the correction across queries
+    history_iterations = 10
+
+    # Parallel sessions per engine for the read-only tests of the catalog. 1 = sequential: latencies
+    # without contention from other tests, comparable with earlier runs; > 1 is faster but noisier
+    catalog_workers = 1
+
+    # Tests changing shared objects (indexes, constraints, scratch tables) run on copies of their tables
+    # in sandbox databases (<database>_sbx_*, dropped at the end), in parallel with the others
+    catalog_sandboxes = True
+
+    # Client-side phase spans (check, execute, first row, fetch, commit) of every timed execution,
+    # written as JSON lines with OpenTelemetry field names (None = no tracing)
+    trace_file = None # e.g. "openhalo_query_spans.jsonl"
+
+    # Workload profile for the stress tests: None = single lookup query, or a name from
+    # StressTester.WORKLOAD_PROFILES ('read_only', 'mixed_80_15_5', 'write_heavy')
+    stress_profile = None
+
+    # Connection pool for the stress workers: None = one dedicated connection per thread, otherwise the threads
+    # share this many connections (checked out per operation, session reset on release, wait time reported)
+    stress_pool_size = None
+
+    # Load generator processes for the stress tests (> 1 when the client CPU is the bottleneck)
+    stress_processes = 1
+
+    # Open-loop stress test: target rate in queries/sec (None = skipped), 'constant' or 'poisson' arrivals
+    open_loop_qps = None
+    open_loop_arrival = 'constant'
+
+    # asyncio stress test: number of mostly idle sessions (None = skipped), mean think time between queries
+    async_sessions = None
+    async_think_time_seconds = 1.0
+
+    # Connection storm: sizes of the simultaneous connect bursts (None = skipped), e.g. [10, 50, 100, 200, 500],
+    # followed by connection-per-request vs persistent sessions
+    connection_burst_sizes = None
+
+    # Scalability sweep: concurrency levels to step through (None = skipped), e.g. [1, 2, 4, 8, 16, 32, 64, 128, 256]
+    sweep_levels = None
+    sweep_warmup_seconds = 2
+    sweep_duration_seconds = 5
     
     # --- Setup ---
     print("="*60)
     print("OpenHalo vs MySQL - Full Markdown Compatibility Suite")
     print("="*60)
 
-    db = DualDatabaseConnector(openhalo_config, mysql_config)
+    # Third target: the PostgreSQL version of each read-only query runs natively on the OpenHalo backend
+    # Pools: the suite sessions plus one session per parallel catalog worker
+    db = DualDatabaseConnector(openhalo_config, mysql_config, pool_size=catalog_workers + 1,
+                               pg_config=openhalo_pg_config if pg_baseline else None)
     db.connect()
 
     # Reduced iterations for compatibility check
-    tester = DualQueryTester(db, iterations=3, warmup=1)
+    iterations = 3
+    # Warm-up runs per SELECT and target; e.g. 30 = repeat the warm-up until the latency is stable
+    # (coefficient of variation of the last 5 runs <= 10%, at most 5 seconds per query)
+    max_warmup_runs = 1
+    if history_db and iterations < history_iterations:
+        iterations = max(history_iterations, RunHistoryStore.MIN_SAMPLES)
+        print(f"ℹ Run history: {iterations} measured runs per SELECT so that runs can be compared "
+              f"(DML statements run once and are not compared)")
+    # Streaming: results are counted in fetchmany batches instead of fetchall() (time to first row is recorded)
+    server_stats = {}
+    if collect_server_stats:
+        server_stats['MySQL'] = ServerStatsCollector(mysql_config)
+        if openhalo_pg_config:
+            server_stats['OpenHalo'] = ServerStatsCollector(openhalo_pg_config, 'postgres')
+        else:
+            print("⚠ OpenHalo server statistics need openhalo_pg_config (pg_stat_statements)")
+    plan_collector = PlanCollector(mysql_config, openhalo_pg_config, explain_slow_ratio) if explain_slow_ratio else None
+    tester = DualQueryTester(db, iterations=iterations, warmup=1, stream_results=True, prepared=prepared_statements,
+                             trace_file=trace_file, server_stats=server_stats, plan_collector=plan_collector,
+                             ci_target=ci_target, ci_budget_seconds=ci_budget_seconds,
+                             max_warmup_runs=max_warmup_runs)
 
     builder = DynamicQueryBuilder('name_basics')
     
     table_nb = "name_basics"
-    
-    # =========================================================================
-    # TESTS FROM MARKDOWN REPORT
-    # =========================================================================
-
-    # --- 1. Basic Queries ---
-    print("\n--- 1. Basic Queries ---")
-    tester.test_query("md_1.1", "Simple Field Query", 
-        f"SELECT * FROM {table_nb} WHERE primaryprofession = 'actor';")
-    
-    tester.test_query("md_1.2", "Multi-Criteria Pattern Match", 
-        f"SELECT * FROM {table_nb} WHERE birthyear > 1970 AND primaryprofession LIKE '%actor%';")
-
-    # --- 2. Filtering and Sorting ---
-    print("\n--- 2. Filtering and Sorting ---")
-    tester.test_query("md_2.1", "ORDER BY Multiple Conditions", 
-        f"SELECT primaryname, birthyear, primaryprofession FROM {table_nb} WHERE deathyear IS NULL AND birthyear IS NOT NULL ORDER BY birthyear ASC LIMIT 10;")
-
-    # --- 3. Aggregation and Statistics ---
-    print("\n--- 3. Aggregation and Statistics ---")
-    tester.test_query("md_3.1", "GROUP BY with COUNT", 
-        f"SELECT primaryprofession, COUNT(*) AS total FROM {table_nb} GROUP BY primaryprofession ORDER BY total DESC LIMIT 10;")
-
-    tester.test_query("md_3.2", "AVG Aggregation Multi Column", 
-        f"SELECT primaryprofession, AVG(birthyear) AS avg_birthyear, COUNT(*) AS total FROM {table_nb} WHERE birthyear IS NOT NULL GROUP BY primaryprofession ORDER BY total DESC LIMIT 10;")
-
-    tester.test_query("md_3.3", "MIN/MAX Functions", 
-        f"SELECT MAX(birthyear) AS most_recent, MIN(birthyear) AS oldest FROM {table_nb} WHERE birthyear IS NOT NULL;")
-
-    tester.test_query("md_3.4", "Advanced Grouping (FLOOR)", 
-        f"SELECT FLOOR(birthyear/10)*10 AS decade, COUNT(*) AS total FROM {table_nb} WHERE birthyear IS NOT NULL GROUP BY decade ORDER BY decade DESC;")
-
-    # --- 4. Generating Dynamic SELECTs ---
-    # We will generate 10 completely different select queries
-    print("\n--- Generating 10 Random SELECT/WHERE/ORDER scenarios ---")
-    for i in range(1, 11):
-        # The builder returns a description and the SQL query
-        desc, sql = builder.build_select(mode='random', limit=random.randint(5, 50))
-        
-        query_id = f"dyn_sel_{i}"
-        tester.test_query(query_id, desc, sql)
-
-    # --- 5. Generating Dynamic Aggregations ---
-    print("\n--- Generating 5 Random Aggregation scenarios ---")
-    for i in range(1, 6):
-        desc, sql = builder.build_aggregation()
-        
-        query_id = f"dyn_agg_{i}"
-        tester.test_query(query_id, desc, sql)
-
-
-    # Phase 3: Complex Filters (IN, BETWEEN)
-    print("\n--- 3. GGenerating Complex Filters ---")
-    for i in range(1, 6):
-        desc, sql = builder.build_complex_where()
-        tester.test_query(f"dyn_cplx_{i:02d}", desc, sql)
-
-    # Phase 4: Scalar Functions (String/Math)
-    print("\n--- 4. Scalar Functions ---")
-    for i in range(1, 6):
-        desc, sql = builder.build_scalar_function()
-        tester.test_query(f"dyn_func_{i:02d}", desc, sql)
-
-    # Phase 5: Subqueries
-    print("\n--- 5. Subqueries ---")
-    for i in range(1, 4):
-        desc, sql = builder.build_subquery()
-        tester.test_query(f"dyn_sub_{i:02d}", desc, sql)
-
-    # Phase 6: DML Lifecycle (Insert/Update/Delete)
-    print("\n--- 6. DML Lifecycle (Safe) ---")
-    # We generate a complete sequence of DML operations
-    dml_steps = builder.build_dml_lifecycle()
-    for desc, sql in dml_steps:
-        # For DML, we don't want to execute it 3 times (otherwise duplicate key error), so we temporarily force iterations=1
-        old_iter = tester.iterations
-        tester.iterations = 1 
-        tester.test_query("dyn_dml", "DML Lifecycle", sql)
-        tester.iterations = old_iter
-
-    # --- 7. Data Manipulation (CRUD) ---
-    print("\n--- 7. Data Manipulation (CRUD) ---")
-    # Using specific ID from MD report: nm9999999
-    crud_id = 'nm9999999'
-    
-    # Preventive cleanup
-    tester.test_query("md_4.0_cleanup", "Pre-CRUD Cleanup", 
-        f"DELETE FROM {table_nb} WHERE nconst = '{crud_id}';")
-
-    tester.test_query("md_4.1", "INSERT Operation", 
-        f"INSERT INTO {table_nb} (nconst, primaryname, birthyear, deathyear, primaryprofession, knownfortitles) VALUES ('{crud_id}', 'Test Actor', 1990, NULL, 'actor', 'tt1234567');")
-
-    tester.test_query("md_4.2", "SELECT Verification", 
-        f"SELECT * FROM {table_nb} WHERE nconst = '{crud_id}';")
-
-    tester.test_query("md_4.3", "UPDATE Operation", 
-        f"UPDATE {table_nb} SET birthyear = 1985 WHERE nconst = '{crud_id}';")
-
-    tester.test_query("md_4.3_verify", "Verify UPDATE", 
-        f"SELECT birthyear FROM {table_nb} WHERE nconst = '{crud_id}';")
-
-    tester.test_query("md_4.4", "DELETE Operation", 
-        f"DELETE FROM {table_nb} WHERE nconst = '{crud_id}';")
-
-    # --- 8. Index Management ---
-    print("\n--- 8. Index Management ---")
 
-    # --- PRELIMINARY CLEANUP (Clean Slate) ---
-    # To ensure the "CREATE INDEX" test works every time (and truly measures the time),
-    # we must first drop the indexes if they already exist.
-    
-    def safe_drop_index(conn, table, index_name):
+    # --- 0. Dataset loading and consistency between both engines ---
+    if load_imdb_dumps:
+        dump_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'DatabasesIMDB')
+        mysql_dump = os.path.join(dump_dir, 'name_basics_mysql.sql')
+        if openhalo_pg_config:
+            oh_job = (openhalo_pg_config, os.path.join(dump_dir, 'name_basics_postgres.sql'), 'postgres')
+        else:
+            oh_job = (openhalo_config, mysql_dump, 'mysql')
         try:
-            if conn:
-                cursor = conn.cursor()
-                cursor.execute(f"DROP INDEX {index_name} ON {table}")
-                conn.commit()
-                cursor.close()
-        except:
-            pass # We ignore the error if the index did not exist yet
-
-    # We clean up on both databases
-    safe_drop_index(db.openhalo_conn, table_nb, 'idx_profession')
-    safe_drop_index(db.mysql_conn, table_nb, 'idx_profession')
-    safe_drop_index(db.openhalo_conn, table_nb, 'idx_birthyear')
-    safe_drop_index(db.mysql_conn, table_nb, 'idx_birthyear')
-
-    # --- TEST EXECUTION ---
-    
-    # Test 5.1 : Now it will work because we cleaned up before
-    tester.test_query("md_5.1", "CREATE INDEX VARCHAR", 
-        f"CREATE INDEX idx_profession ON {table_nb}(primaryprofession);")
-
-    # Test 5.2
-    tester.test_query("md_5.2", "CREATE INDEX INT", 
-        f"CREATE INDEX idx_birthyear ON {table_nb}(birthyear);")
-    
-    # Test 5.3 : Verification
-    tester.test_query("md_5.3", "SHOW INDEX", f"SHOW INDEX FROM {table_nb};")
+            tester.benchmarks['load'] = load_dumps_concurrently(
+                {'OpenHalo': oh_job, 'MySQL': (mysql_config, mysql_dump, 'mysql')}, workers=loader_workers)
+        except Exception as e:
+            print(f"  ➜ Dump loading failed: {e}")
 
-    # --- 6. Join Operations ---
-    print("\n--- 6. Join Operations ---")
-    # Prerequisite: films and film_actor tables must exist for these to pass
-    
-    tester.test_query("md_6.1", "Multi-Table INNER JOIN", 
-        f"""
-        SELECT nb.primaryname, f.title, f.release_year 
-        FROM {table_nb} nb 
-        JOIN film_actor fa ON nb.nconst = fa.nconst 
-        JOIN films f ON fa.film_id = f.film_id 
-        LIMIT 10;
-        """)
-
-    tester.test_query("md_6.2", "LEFT JOIN with Aggregation", 
-        f"""
-        SELECT nb.primaryname, COUNT(fa.film_id) AS nb_films 
-        FROM {table_nb} nb 
-        LEFT JOIN film_actor fa ON nb.nconst = fa.nconst 
-        WHERE nb.birthyear > 1980 
-        GROUP BY nb.nconst, nb.primaryname 
-        ORDER BY nb_films DESC LIMIT 10;
-        """)
-
-    tester.test_query("md_6.3", "JOIN Multiple Conditions", 
-        f"""
-        SELECT nb.primaryname, f.title, f.rating, fa.role 
-        FROM {table_nb} nb 
-        JOIN film_actor fa ON nb.nconst = fa.nconst 
-        JOIN films f ON fa.film_id = f.film_id 
-        WHERE f.rating > 7.0 AND nb.primaryprofession LIKE '%actor%' 
-        ORDER BY f.rating DESC LIMIT 10;
-        """)
-
-    tester.test_query("md_6.4", "SELF JOIN", 
-        "SELECT f1.title AS film1, f2.title AS film2, f1.genre FROM films f1 JOIN films f2 ON f1.genre = f2.genre AND f1.film_id < f2.film_id LIMIT 10;")
-
-    tester.test_query("md_6.5", "JOIN with HAVING and DISTINCT", 
-        f"""
-        SELECT nb.primaryname, COUNT(DISTINCT f.genre) AS nb_genres 
-        FROM {table_nb} nb 
-        JOIN film_actor fa ON nb.nconst = fa.nconst 
-        JOIN films f ON fa.film_id = f.film_id 
-        GROUP BY nb.nconst, nb.primaryname 
-        HAVING COUNT(DISTINCT f.genre) > 1 LIMIT 10;
-        """)
-
-    tester.test_query("md_6.6", "Subquery with JOIN", 
-        f"""
-        SELECT f.title, f.rating 
-        FROM films f 
-        WHERE f.film_id IN (
-            SELECT fa.film_id 
-            FROM film_actor fa 
-            JOIN {table_nb} nb ON fa.nconst = nb.nconst 
-            WHERE nb.birthyear < 1950
-        ) LIMIT 10;
-        """)
-
-    # --- 7. Views and Transactions ---
-    print("\n--- 7. Views and Transactions ---")
-    
-    tester.test_query("md_7.1", "CREATE VIEW", 
-        f"CREATE OR REPLACE VIEW actor_summary AS SELECT primaryname, birthyear, primaryprofession FROM {table_nb} WHERE primaryprofession = 'actor' ORDER BY birthyear DESC;")
-    
-    tester.test_query("md_7.2", "Query VIEW", "SELECT * FROM actor_summary LIMIT 10;")
-    
-    tester.test_query("md_7.3", "DROP VIEW", "DROP VIEW actor_summary;")
+    if synthetic_scale:
+        try:
+            tester.benchmarks['synthetic'] = generate_synthetic_dataset(
+                {'OpenHalo': openhalo_config, 'MySQL': mysql_config}, synthetic_scale, synthetic_seed, loader_workers)
+        except Exception as e:
+            print(f"  ➜ Synthetic data generation failed: {e}")
 
-    # Transactions (using explicit SQL though connectors handle this via autocommit settings)
-    # Note: Explicit START TRANSACTION inside execute might behave differently depending on connector,
-    # but we are testing if the database accepts the syntax.
-    trans_id = 'nm8888888'
-    
-    # 7.4 Commit
-    tester.test_query("md_7.4_a", "Transaction START", "START TRANSACTION;")
-    tester.test_query("md_7.4_b", "Transaction INSERT", f"INSERT INTO {table_nb} (nconst, primaryname, birthyear) VALUES ('{trans_id}', 'Trans Test', 1995);")
-    tester.test_query("md_7.4_c", "Transaction COMMIT", "COMMIT;")
-    tester.test_query("md_7.4_d", "Verify Commit", f"SELECT * FROM {table_nb} WHERE nconst = '{trans_id}';")
-    
-    # 7.5 Rollback
-    tester.test_query("md_7.5_a", "Rollback START", "START TRANSACTION;")
-    tester.test_query("md_7.5_b", "Rollback DELETE", f"DELETE FROM {table_nb} WHERE nconst = '{trans_id}';")
-    tester.test_query("md_7.5_c", "Rollback EXEC", "ROLLBACK;")
-    tester.test_query("md_7.5_d", "Verify Rollback (Row should exist)", f"SELECT * FROM {table_nb} WHERE nconst = '{trans_id}';")
-    
-    # Cleanup transaction test
-    tester.test_query("md_7_cleanup", "Cleanup Trans", f"DELETE FROM {table_nb} WHERE nconst = '{trans_id}';")
-
-    # --- 8. String Functions ---
-    print("\n--- 8. String Functions ---")
-    tester.test_query("md_8.1", "CONCAT", f"SELECT CONCAT(primaryname, ' (', birthyear, ')') AS full_info FROM {table_nb} WHERE birthyear IS NOT NULL LIMIT 10;")
-    tester.test_query("md_8.2", "SUBSTRING", f"SELECT primaryname, SUBSTRING(primaryname, 1, 10) AS short_name FROM {table_nb} LIMIT 10;")
-    tester.test_query("md_8.3", "UPPER/LOWER", f"SELECT UPPER(primaryname), LOWER(primaryprofession) FROM {table_nb} LIMIT 10;")
-    tester.test_query("md_8.4", "LENGTH", f"SELECT primaryname, LENGTH(primaryname) AS len FROM {table_nb} ORDER BY len DESC LIMIT 10;")
-    tester.test_query("md_8.5", "REPLACE", f"SELECT primaryname, REPLACE(primaryname, ' ', '_') FROM {table_nb} LIMIT 10;")
-    tester.test_query("md_8.6", "TRIM", f"SELECT primaryname, TRIM(primaryname) FROM {table_nb} LIMIT 10;")
-
-    # --- 9. Advanced SQL ---
-    print("\n--- 9. Advanced SQL ---")
-    tester.test_query("md_9.1", "UNION (Expected Fail on OH)", 
-        f"(SELECT primaryname FROM {table_nb} WHERE primaryprofession = 'actor' LIMIT 5) UNION (SELECT primaryname FROM {table_nb} WHERE primaryprofession = 'actress' LIMIT 5);")    
-    tester.test_query("md_9.2", "CASE WHEN", 
-        f"""
-        SELECT primaryname, 
-        CASE 
-            WHEN birthyear < 1950 THEN 'Vintage' 
-            WHEN birthyear BETWEEN 1950 AND 1980 THEN 'Classic' 
-            ELSE 'Modern' 
-        END AS era 
-        FROM {table_nb} LIMIT 10;
-        """)
-
-    # 9. Show Table Status (Manquant dans le script original)
-    try:
-        # We try changing DB (which often fails on OH according to the report) 
-        # then display the status
-        tester.test_query("prob_9_use", "USE DB", f"USE {openhalo_config['database']};")
-        tester.test_query("prob_9_status", "SHOW TABLE STATUS", "SHOW TABLE STATUS;")
-    except:
-        pass
-
-    # --- 10. Database Constraints ---
-    print("\n--- 10. Database Constraints ---")
-    # Note: Using ALTER TABLE requires exclusive locks usually
-    
-    tester.test_query("md_10.1", "Add UNIQUE Constraint", "ALTER TABLE films ADD CONSTRAINT unique_title UNIQUE (title);")
-    # Test violation
-    tester.test_query("md_10.1_fail", "Test UNIQUE Violation", "INSERT INTO films (film_id, title) VALUES ('tt999', 'Example Film 1');")
-    
-    
-    # Step 1: Remove actors in film_actor who do not exist in name_basics
-    tester.test_query("md_10.2_pre", "Cleanup Orphan Records", 
-        f"DELETE FROM film_actor WHERE nconst NOT IN (SELECT nconst FROM {table_nb});")
-    # Step 2: Now that the data is clean, we can add the FK
-    tester.test_query("md_10.2", "Add FK Constraint", 
-        f"ALTER TABLE film_actor ADD CONSTRAINT fk_actor FOREIGN KEY (nconst) REFERENCES {table_nb}(nconst);")
-    
-    tester.test_query("md_10.3", "Add CHECK Constraint", 
-        "ALTER TABLE films ADD CONSTRAINT check_year CHECK (release_year > 1800 AND release_year <= 2100);")
-    
-    # Drop constraints
-    tester.test_query("md_10.4_a", "Drop UNIQUE", "ALTER TABLE films DROP CONSTRAINT unique_title;")
-    tester.test_query("md_10.4_b", "Drop CHECK", "ALTER TABLE films DROP CONSTRAINT check_year;")
-    tester.test_query("md_10.4_c", "Drop FK", "ALTER TABLE film_actor DROP CONSTRAINT fk_actor;")
-
-    # --- 11. Advanced Subqueries ---
-    print("\n--- 11. Advanced Subqueries ---")
-    tester.test_query("md_11.1", "Derived Table", 
-        f"SELECT * FROM (SELECT primaryname, birthyear FROM {table_nb} WHERE birthyear > 1980) AS young_actors LIMIT 10;")
-    
-    tester.test_query("md_11.2", "Correlated Subquery", 
-        f"""
-        SELECT nb1.primaryname, nb1.birthyear 
-        FROM {table_nb} nb1 
-        WHERE nb1.birthyear > (
-            SELECT AVG(birthyear) 
-            FROM {table_nb} nb2 
-            WHERE nb2.primaryprofession = nb1.primaryprofession 
-            AND nb2.birthyear IS NOT NULL
-        ) LIMIT 10;
-        """)
+    if check_table_consistency:
+        if openhalo_pg_config:
+            checker = TableConsistencyChecker(openhalo_pg_config, mysql_config, openhalo_dialect='postgres')
+        else:
+            checker = TableConsistencyChecker(openhalo_config, mysql_config)
+        tester.benchmarks['consistency'] = []
+        for table in checker.TABLES:
+            try:
+                tester.benchmarks['consistency'].append(checker.check_table(table))
+            except Exception as e:
+                print(f"  ➜ Consistency check of {table} failed: {e}")
     
-    tester.test_query("md_11.3", "EXISTS Operator", 
-        f"SELECT primaryname FROM {table_nb} nb WHERE EXISTS (SELECT 1 FROM film_actor fa WHERE fa.nconst = nb.nconst) LIMIT 10;")
+    # =========================================================================
+    # TESTS FROM MARKDOWN REPORT (test_catalog.json)
+    # =========================================================================
 
-    # --- 12. Data Export ---
-    print("\n--- 12. Data Export ---")
+    # --- Data Export: INTO OUTFILE target ---
     # By default, we try /tmp/
     export_path = "/tmp/test_export.csv"
     
@@ -1038,91 +4268,30 @@ def main():
     except Exception as e:
         print(f"  [System] Warning: Could not detect secure_file_priv: {e}")
 
-    # We run the test with the adapted path
-    # Note: OpenHalo will fail anyway (Syntax Error), so the path doesn't matter for it.
-    # For MySQL, this should now pass (if the user has FILE rights).
-    tester.test_query("md_12.1", "INTO OUTFILE (Expected Fail on OH)", 
-        f"SELECT * FROM {table_nb} LIMIT 10 INTO OUTFILE '{export_path.replace(chr(92), '/')}' FIELDS TERMINATED BY ',' ENCLOSED BY '\"' LINES TERMINATED BY '\\n';")
-    import subprocess
-
-    print("\n--- 12.2 Shell Export (System Command) ---")
-    try:
-        cmd = f"mysql -P {mysql_config['port']} -h {mysql_config['host']} -u {mysql_config['user']} -p{mysql_config['password']} -e 'USE {mysql_config['database']}; SELECT * FROM {table_nb} LIMIT 5;' | sed 's/\\t/,/g'"
-        # We do not actually execute it to avoid spamming the console, but we log that it is a manual/system test
-        print("  [System] Shell export command defined but skipped in Python connector test.")
-    except Exception as e:
-        print(f"  [System] Error defining shell command: {e}")
-
-    # --- 13. Advanced Features ---
-    print("\n--- 13. Advanced Features ---")
-    tester.test_query("md_13.1", "Fuzzy Search LIKE", f"SELECT * FROM {table_nb} WHERE primaryname LIKE '%Leonardo%DiCaprio%';")
-
-    # =========================================================================
-    # PROBLEMATIC QUERIES (From MD Report)
-    # =========================================================================
-    print("\n--- PROBLEMATIC / MISSING FEATURES (From Report) ---")
-
-    # 1. JSON Helpers
-    tester.test_query("prob_1", "JSON_EXTRACT", "SELECT JSON_EXTRACT('{\"a\": 1}', '$.a');")
-    
-    # 2. Multi-table DELETE
-    # Creating a temp table for safety
-    tester.test_query("prob_2_setup", "Setup Temp for Delete", f"CREATE TABLE IF NOT EXISTS nb_test AS SELECT * FROM {table_nb} LIMIT 10;")
-    tester.test_query("prob_2", "Multi-table DELETE JOIN", 
-        "DELETE nb FROM nb_test nb JOIN nb_test nb2 ON nb.nconst = nb2.nconst WHERE nb.birthyear < 1800;")
-    tester.test_query("prob_2_cleanup", "Cleanup Temp", "DROP TABLE IF EXISTS nb_test;")
-
-    # 3. Explicit Index Hints
-    tester.test_query("prob_3", "FORCE INDEX", f"SELECT * FROM {table_nb} FORCE INDEX (PRIMARY) WHERE birthyear < 1900 LIMIT 5;")
-
-    # 4. Partitioning Syntax
-    tester.test_query("prob_4", "CREATE TABLE PARTITION", 
-        """
-        CREATE TABLE part_test (id INT, created_at DATE, PRIMARY KEY (id, created_at)) 
-        PARTITION BY RANGE (YEAR(created_at)) (
-            PARTITION p0 VALUES LESS THAN (2000), 
-            PARTITION p1 VALUES LESS THAN (2010)
-        );
-        """)
-    tester.test_query("prob_4_cleanup", "Drop Partition Table", "DROP TABLE IF EXISTS part_test;")
-
-    # 5. Stored Procedures
-    # Note: Sending CREATE PROCEDURE via Python connector often works without DELIMITER keywords if strictly one statement
-    tester.test_query("prob_5_create", "CREATE PROCEDURE", 
-        f"CREATE PROCEDURE get_actors() BEGIN SELECT * FROM {table_nb} WHERE primaryprofession LIKE '%actor%' LIMIT 5; END")
-    tester.test_query("prob_5_call", "CALL PROCEDURE", "CALL get_actors();")
-    tester.test_query("prob_5_drop", "DROP PROCEDURE", "DROP PROCEDURE IF EXISTS get_actors;")
-
-    # 6. Fulltext Search
-    try:
-        tester.test_query("prob_6_idx", "CREATE FULLTEXT INDEX", f"CREATE FULLTEXT INDEX ft_name ON {table_nb} (primaryname);")
-    except: pass
-    tester.test_query("prob_6_match", "MATCH AGAINST", f"SELECT * FROM {table_nb} WHERE MATCH(primaryname) AGAINST('Fred' IN NATURAL LANGUAGE MODE);")
-
-    # 7. Spatial
-    try:
-        tester.test_query("prob_7_idx", "CREATE SPATIAL INDEX", f"CREATE SPATIAL INDEX idx_spatial ON {table_nb} (primaryname);") # Invalid col but testing syntax
-    except: pass
-    tester.test_query("prob_7_func", "Spatial Function", "SELECT ST_Distance(POINT(0,0), POINT(1,1));")
-
-    # 8. Handler
-    tester.test_query("prob_8", "HANDLER OPEN", f"HANDLER {table_nb} OPEN;")
-
-    # --- 9. Show Table Status ---
-    # The report indicates this often fails due to the DB context
-    tester.test_query("prob_9", "SHOW TABLE STATUS", "SHOW TABLE STATUS;")
-
-    # 10. Get Diagnostics
-    tester.test_query("prob_10", "GET DIAGNOSTICS", "GET DIAGNOSTICS @rows = ROW_COUNT;")
+    catalog = load_test_catalog(CATALOG_FILE, {'table_nb': table_nb, 'database': openhalo_config['database'],
+                                               'export_path': export_path.replace(chr(92), '/')}, builder)
+    # Independent read-only tests run concurrently; chains, writes and DDL keep the catalog order,
+    # except those isolated in sandboxes
+    sandboxes = SandboxManager({'OpenHalo': openhalo_config, 'MySQL': mysql_config}) if catalog_sandboxes else None
+    CatalogScheduler(tester, catalog, workers=catalog_workers, sandboxes=sandboxes).run()
 
     # --- 14. PERFORMANCE BENCHMARKS ---
     print("\n" + "="*60)
     print("PERFORMANCE BENCHMARKS (Stress & Bulk)")
     print("="*60)
 
-    # 1. Bulk Insert
-    test_bulk_insert("OpenHalo", openhalo_config)
-    test_bulk_insert("MySQL", mysql_config)
+    # 1. Bulk Insert: ingest method x batch size x commit interval x loader connections
+    bulk_data = {}
+    for name, config in [('OpenHalo', openhalo_config), ('MySQL', mysql_config)]:
+        if bulk_matrix:
+            bulk_data[name] = run_bulk_ingest_matrix(name, config, bulk_methods, bulk_batch_sizes,
+                                                     bulk_commit_intervals, bulk_connections, bulk_total_rows)
+        else:
+            # What the single executemany call used to send (the text cursor rewrites it as one multi-row INSERT)
+            cell = test_bulk_insert(name, config, 5000, 'multirow')
+            bulk_data[name] = [cell] if cell else []
+    print_bulk_ingest_matrix(bulk_data)
+    tester.benchmarks['bulk_ingest'] = bulk_data
 
     # 2. Stress Test (Concurrency) & Graphiques Complets
     print("\n--- Generating Performance Benchmarks (TPS & Latency) ---")
@@ -1130,13 +4299,57 @@ def main():
     results_data = {}
     
     # Test OpenHalo
-    stress = StressTester(openhalo_config, num_threads=10, duration_seconds=5)
+    stress = StressTester(openhalo_config, num_threads=10, duration_seconds=5, num_processes=stress_processes,
+                          profile=stress_profile, prepared=prepared_statements,
+                          pool_size=stress_pool_size)
     results_data['OpenHalo'] = stress.run_benchmark("OpenHalo")
 
     # Test MySQL
-    stress_mysql = StressTester(mysql_config, num_threads=10, duration_seconds=5)
+    stress_mysql = StressTester(mysql_config, num_threads=10, duration_seconds=5, num_processes=stress_processes,
+                                profile=stress_profile, prepared=prepared_statements,
+                                pool_size=stress_pool_size)
     results_data['MySQL'] = stress_mysql.run_benchmark("MySQL")
 
+    # Open loop: fixed arrival rate, latency measured from the intended send time
+    if open_loop_qps:
+        for name, config in [('OpenHalo', openhalo_config), ('MySQL', mysql_config)]:
+            StressTester(config, num_threads=10, duration_seconds=5, target_qps=open_loop_qps,
+                         arrival=open_loop_arrival, num_processes=stress_processes,
+                         profile=stress_profile, prepared=prepared_statements,
+                         pool_size=stress_pool_size).run_benchmark(name)
+
+    # asyncio engine: thousands of mostly idle application connections
+    if async_sessions:
+        for name, config in [('OpenHalo', openhalo_config), ('MySQL', mysql_config)]:
+            try:
+                AsyncStressTester(config, num_sessions=async_sessions, think_time_seconds=async_think_time_seconds,
+                                  num_processes=stress_processes).run_benchmark(name)
+            except Exception as e:
+                print(f"  ➜ Async stress test failed: {e}")
+
+    # Connection setup cost: bursts of simultaneous connects, connection per request vs persistent sessions
+    if connection_burst_sizes:
+        connection_data = {}
+        for name, config in [('OpenHalo', openhalo_config), ('MySQL', mysql_config)]:
+            connection_data[name] = run_connection_benchmark(name, config, connection_burst_sizes)
+        tester.benchmarks['connections'] = connection_data
+        try:
+            plot_connection_storm(connection_data)
+        except Exception as e:
+            print(f"⚠ Connection storm graph error: {e}")
+
+    # Scalability sweep: TPS / latency curve and saturation knee
+    if sweep_levels:
+        sweep_data = {}
+        for name, config in [('OpenHalo', openhalo_config), ('MySQL', mysql_config)]:
+            sweep_data[name] = run_scalability_sweep(name, config, sweep_levels,
+                                                     sweep_warmup_seconds, sweep_duration_seconds, stress_processes,
+                                                     stress_profile, prepared_statements)
+        try:
+            plot_scalability_sweep(sweep_data)
+        except Exception as e:
+            print(f"⚠ Scalability graph error: {e}")
+
     # --- Generating Performance Graphs (TPS and Latency) ---
     try:
         targets = list(results_data.keys())
@@ -1180,6 +4393,13 @@ def main():
     except Exception as e:
         print(f"⚠ Erreur graphique : {e}")
 
+    # Per-second time series, saved with the report and plotted next to the full report
+    tester.benchmarks['stress'] = results_data
+    try:
+        plot_stress_timeseries(results_data)
+    except Exception as e:
+        print(f"⚠ Time series graph error: {e}")
+
     # --- 15. COMPLEX QUERIES COMPARISON GRAPH ---
     print("\n--- Generating Complex Queries Comparison Graph ---")
 
@@ -1297,9 +4517,22 @@ def main():
     # --- Finalize ---
     tester.generate_report()
     tester.generate_summary()
+    if history_db:
+        store = RunHistoryStore(history_db)
+        store.record_run(tester.results,
+                         openhalo_build or RunHistoryStore.server_version(db.openhalo_conn),
+                         RunHistoryStore.server_version(db.mysql_conn) if db.mysql_conn else None,
+                         f"synthetic x{synthetic_scale}" if synthetic_scale else "imdb", run_label)
+        store.close()
+    for collector in server_stats.values():
+        collector.close()
+    if plan_collector:
+        plan_collector.close()
     db.close()
     print("\n✓ Full Markdown Compatibility Suite Complete!")
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(history_command(sys.argv[1:]))
     main()
@@ -20,6 +20,7 @@ import matplotlib
 matplotlib.use('Agg') # Essentiel pour Docker (pas d'interface graphique)
 import numpy as np
 import os
+from latency_histogram import LatencyHistogram # Copied next to this script (see the Dockerfile)
 
 # --- Configuration des Dossiers ---
 OUTPUT_DIR = "/home/halo/reports"
@@ -38,6 +39,8 @@ class QueryResult:
     status: str
     rows: int
     error: str = None
+    p99_time: float = 0
+    max_time: float = 0
 
 # --- Dual Database Connector ---
 
@@ -155,7 +158,7 @@ class DualQueryTester:
         # Test OpenHalo
         try:
             res, elapsed = self.execute_query(oh_sql, self.db.openhalo_conn)
-            self.results.append(QueryResult('OpenHalo', q_id, q_type, [elapsed], elapsed, elapsed, 0, "OK", len(res)))
+            self.results.append(QueryResult('OpenHalo', q_id, q_type, [elapsed], elapsed, elapsed, elapsed, "OK", len(res), None, elapsed, elapsed))
             print(f"  [OpenHalo] Success: {elapsed:.2f}ms")
         except Exception as e:
             self.results.append(QueryResult('OpenHalo', q_id, q_type, [], 0, 0, 0, "Error", 0, str(e)))
@@ -165,7 +168,7 @@ class DualQueryTester:
         if self.db.mysql_conn:
             try:
                 res, elapsed = self.execute_query(my_sql, self.db.mysql_conn)
-                self.results.append(QueryResult('MySQL', q_id, q_type, [elapsed], elapsed, elapsed, 0, "OK", len(res)))
+                self.results.append(QueryResult('MySQL', q_id, q_type, [elapsed], elapsed, elapsed, elapsed, "OK", len(res), None, elapsed, elapsed))
                 print(f"  [MySQL] Success: {elapsed:.2f}ms")
             except Exception as e:
                 self.results.append(QueryResult('MySQL', q_id, q_type, [], 0, 0, 0, "Error", 0, str(e)))
@@ -188,31 +191,37 @@ class StressTester:
         self.duration = duration_seconds
 
     def _worker_task(self, table_name):
+        hist, errors = LatencyHistogram(), 0 # Local to the thread, merged in run_benchmark
         try:
             conn = mysql.connector.connect(**self.db_config)
             cursor = conn.cursor()
-            latencies, end_time = [], time.time() + self.duration
+            end_time = time.time() + self.duration
             while time.time() < end_time:
                 try:
                     s = time.perf_counter()
                     cursor.execute(f"SELECT * FROM {table_name} LIMIT 1")
                     cursor.fetchall()
-                    latencies.append((time.perf_counter() - s) * 1000)
-                except: pass
+                    hist.record((time.perf_counter() - s) * 1000)
+                except: errors += 1
             conn.close()
-            return latencies
-        except: return []
+            return hist, errors
+        except: return hist, errors + 1
 
     def run_benchmark(self, target_name, table_name):
         print(f"🔥 Stress Test {target_name} on {table_name}...")
+        hist, errors = LatencyHistogram(), 0
         with concurrent.futures.ThreadPoolExecutor(max_workers=self.num_threads) as executor:
             futures = [executor.submit(self._worker_task, table_name) for _ in range(self.num_threads)]
-            all_lats = [lat for f in concurrent.futures.as_completed(futures) for lat in f.result()]
+            for f in concurrent.futures.as_completed(futures):
+                h, e = f.result()
+                hist.merge(h); errors += e
         
-        tps = len(all_lats) / self.duration if all_lats else 0
-        p95 = np.percentile(all_lats, 95) if all_lats else 0
-        print(f"  ➜ {tps:.2f} TPS | P95 Latency: {p95:.2f}ms")
-        return {"tps": tps, "p95_latency": p95}
+        tps = hist.count / self.duration if self.duration > 0 else 0
+        stats = hist.summary()
+        print(f"  ➜ {tps:.2f} TPS | P95: {stats['p95']:.2f}ms | P99: {stats['p99']:.2f}ms | P99.9: {stats['p99.9']:.2f}ms | Max: {stats['max']:.2f}ms")
+        return {"tps": tps, "avg_latency": hist.mean(), "p50_latency": stats['p50'], "p90_latency": stats['p90'],
+                "p95_latency": stats['p95'], "p99_latency": stats['p99'], "p999_latency": stats['p99.9'],
+                "max_latency": stats['max'], "errors": errors}
 
 def test_bulk_insert(target_name, config, table_name, batch_size=5000):
     print(f"\n📦 Bulk Insert Test: {target_name} ({batch_size} rows)")